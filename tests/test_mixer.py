@@ -0,0 +1,56 @@
+import time
+
+from voiceCommand.mixer import FakeMixer, VolumeControl
+
+
+def waitForFlush(control):
+    deadline = time.monotonic() + 2
+    while control.timer is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_burstIsOneWrite():
+    mixer = FakeMixer(level=50)
+    control = VolumeControl(mixer, window=0.1)
+    for _ in range(3):
+        control.adjust(10)
+    waitForFlush(control)
+    assert mixer.writes == [80]
+    assert control.summary() == "Volume: 3 commands in 1 mixer writes"
+
+
+def test_levelIsClamped():
+    mixer = FakeMixer(level=95)
+    control = VolumeControl(mixer, window=0.05)
+    control.adjust(10)
+    waitForFlush(control)
+    control.setLevel(-20)
+    waitForFlush(control)
+    assert mixer.writes == [100, 0]
+
+
+class FailingMixer(FakeMixer):
+    errors = (ConnectionError,)
+
+    def __init__(self):
+        super().__init__()
+        self.closed = False
+
+    def set(self, level):
+        raise ConnectionError("connection lost")
+
+    def close(self):
+        self.closed = True
+
+
+def test_failedSetReopensMixer(monkeypatch):
+    failing = FailingMixer()
+    opened = [failing, FakeMixer(level=30)]
+    monkeypatch.setattr("voiceCommand.mixer.openMixer", lambda name: opened.pop(0))
+    control = VolumeControl("fake", window=0.05)
+    control.adjust(10)
+    waitForFlush(control)
+    assert failing.closed and control.mixer is None
+    control.adjust(10)
+    waitForFlush(control)
+    assert control.mixer.writes == [40]
@@ -0,0 +1,76 @@
+import pytest
+
+from voiceCommand.systemInfo import SystemInfo
+
+STAT = """cpu  100 0 100 700 100 0 0 0 0 0
+cpu0 50 0 50 350 50 0 0 0 0 0
+cpu1 50 0 50 350 50 0 0 0 0 0
+intr 12345
+"""
+
+MEMINFO = """MemTotal:        8000000 kB
+MemFree:         1000000 kB
+MemAvailable:    3000000 kB
+SwapTotal:       2000000 kB
+SwapFree:        1500000 kB
+"""
+
+
+def writeFile(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+@pytest.fixture
+def root(tmp_path):
+    writeFile(tmp_path / "proc/stat", STAT)
+    writeFile(tmp_path / "proc/meminfo", MEMINFO)
+    battery = tmp_path / "sys/class/power_supply/BAT0"
+    writeFile(battery / "type", "Battery\n")
+    writeFile(battery / "status", "Discharging\n")
+    writeFile(battery / "capacity", "42\n")
+    writeFile(tmp_path / "sys/class/power_supply/AC/type", "Mains\n")
+    return tmp_path
+
+
+def test_cpuSinceBoot(root):
+    cpu = SystemInfo(str(root)).query("cpu")["cpu"]
+    assert cpu["percent"] == pytest.approx(20.0)
+    assert cpu["cores"] == [pytest.approx(20.0), pytest.approx(20.0)]
+
+
+def test_cpuBetweenReads(root):
+    info = SystemInfo(str(root))
+    info.query("cpu")
+    # cpu0 busy for all 100 new ticks, cpu1 idle for all of them
+    writeFile(root / "proc/stat", "cpu  200 0 100 800 100 0 0 0 0 0\n"
+                                  "cpu0 150 0 50 350 50 0 0 0 0 0\n"
+                                  "cpu1 50 0 50 450 50 0 0 0 0 0\n")
+    cpu = info.query("cpu")["cpu"]
+    assert cpu["percent"] == pytest.approx(50.0)
+    assert cpu["cores"] == [pytest.approx(100.0), pytest.approx(0.0)]
+
+
+def test_memory(root):
+    memory = SystemInfo(str(root)).query("memory")["memory"]
+    assert memory["total"] == 8000000 * 1024
+    assert memory["available"] == 3000000 * 1024
+    assert memory["used"] == 5000000 * 1024
+    assert memory["swapUsed"] == 500000 * 1024
+
+
+def test_batteryOnly(root):
+    info = SystemInfo(str(root))
+    assert info.query("battery")["battery"] == [{"name": "BAT0", "status": "Discharging", "percent": 42}]
+    assert info.describe("battery") == "Battery BAT0: Discharging, 42%"
+
+
+def test_noBattery(tmp_path):
+    info = SystemInfo(str(tmp_path))
+    assert info.query("battery")["battery"] == []
+    assert info.describe("battery") == "No battery found."
+
+
+def test_tooltip(root):
+    assert SystemInfo(str(root)).tooltip().startswith("CPU 20%, Mem ")
+    assert SystemInfo(str(root)).tooltip().endswith(", Bat 42%")
@@ -0,0 +1 @@
+# Shared engine for the offline voice command assistants.
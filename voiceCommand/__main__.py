@@ -0,0 +1,33 @@
+# Offline voice command assistant.
+#
+#   python3 -m voiceCommand                      Tk window with a mic button
+#   python3 -m voiceCommand --frontend tray      system tray icon
+#
+# The front-end module, and with it tkinter or pystray and PIL, is imported
+# only once it has been chosen.
+
+import argparse
+import importlib
+import os
+
+from voiceCommand.modelLifecycle import MODEL_DIR
+from voiceCommand.options import addPipelineArguments
+
+FRONTENDS = {"tk": "voiceCommand.tkFrontend", "tray": "voiceCommand.trayFrontend"}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m voiceCommand", description="Offline Voice Command Assistant")
+    parser.add_argument("--frontend", choices=FRONTENDS, default="tk",
+                        help="Tk window or system tray icon (default: %(default)s)")
+    parser.add_argument("--model", default=os.path.join(MODEL_DIR, "vosk-model-en-us-0.22"),
+                        help="Vosk model to use if it fits in memory (default: %(default)s)")
+    parser.add_argument("--tray-icon", choices=("status", "plain"), default="status",
+                        help="tray icon coloured by recording state, or a plain black one (default: %(default)s)")
+    addPipelineArguments(parser)
+    args = parser.parse_args(argv)
+    importlib.import_module(FRONTENDS[args.frontend]).run(args)
+
+
+if __name__ == "__main__":
+    main()
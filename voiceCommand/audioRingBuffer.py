@@ -0,0 +1,88 @@
+import threading
+import time
+
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+SKIP_TO_LIVE = "skip-to-live"
+POLICIES = (DROP_OLDEST, DROP_NEWEST, SKIP_TO_LIVE)
+
+
+class AudioRingBuffer:
+    """Fixed-capacity ring of audio blocks between the PortAudio callback and the recognizer.
+
+    Storage is preallocated, so the callback only copies the block into its
+    slot. When the reader falls behind and the ring is full, the overrun
+    policy decides what goes: the oldest block (drop-oldest), the incoming one
+    (drop-newest) or everything queued so decoding resumes at live audio
+    (skip-to-live).
+    """
+
+    def __init__(self, blockFrames, samplerate, capacityMs=2000, policy=DROP_OLDEST, sampleBytes=2):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown overrun policy {policy!r}, expected one of {POLICIES}")
+        self.blockBytes = blockFrames * sampleBytes
+        self.blockMs = 1000.0 * blockFrames / samplerate
+        self.capacity = max(2, int(capacityMs / self.blockMs))
+        self.policy = policy
+        self.storage = bytearray(self.blockBytes * self.capacity)
+        self.view = memoryview(self.storage)
+        self.sizes = [0] * self.capacity
+        self.captured = [0.0] * self.capacity
+        self.head = 0  # blocks read so far
+        self.tail = 0  # blocks written so far
+        self.condition = threading.Condition()
+
+        self.overruns = 0
+        self.droppedBlocks = 0
+        self.lagMs = 0.0
+        self.maxLagMs = 0.0
+        self.lastCaptured = 0.0
+
+    def __len__(self):
+        return self.tail - self.head
+
+    def write(self, data):
+        """Copy one block in; safe to call from the audio callback."""
+        with self.condition:
+            if self.tail - self.head == self.capacity:
+                self.overruns += 1
+                if self.policy == DROP_NEWEST:
+                    self.droppedBlocks += 1
+                    return
+                if self.policy == SKIP_TO_LIVE:
+                    self.droppedBlocks += self.tail - self.head
+                    self.head = self.tail
+                else:
+                    self.droppedBlocks += 1
+                    self.head += 1
+
+            slot = self.tail % self.capacity
+            size = min(len(data), self.blockBytes)
+            offset = slot * self.blockBytes
+            self.view[offset:offset + size] = memoryview(data).cast("B")[:size]
+            self.sizes[slot] = size
+            self.captured[slot] = time.monotonic()
+            self.tail += 1
+            self.condition.notify()
+
+    def read(self, timeout=None):
+        """Return the oldest block, or None if nothing arrived within timeout."""
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.tail > self.head, timeout):
+                return None
+            slot = self.head % self.capacity
+            offset = slot * self.blockBytes
+            data = bytes(self.view[offset:offset + self.sizes[slot]])
+            self.head += 1
+            self.lastCaptured = self.captured[slot]
+            self.lagMs = (time.monotonic() - self.lastCaptured) * 1000
+            self.maxLagMs = max(self.maxLagMs, self.lagMs)
+        return data
+
+    def clear(self):
+        with self.condition:
+            self.head = self.tail
+
+    def summary(self):
+        return (f"Audio buffer: lag {self.lagMs:.0f} ms (max {self.maxLagMs:.0f} ms), "
+                f"{self.overruns} overruns, {self.droppedBlocks} blocks dropped ({self.policy})")
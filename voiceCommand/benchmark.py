@@ -0,0 +1,603 @@
+# Micro-benchmarks for the voice command engine.
+#
+#   python3 -m voiceCommand.benchmark dispatch
+#   python3 -m voiceCommand.benchmark grammar --model /usr/share/vosk/models/vosk-model-en-us-0.22 *.wav
+#   python3 -m voiceCommand.benchmark vad --model /usr/share/vosk/models/vosk-model-en-us-0.22 idle.wav speech.wav
+#   python3 -m voiceCommand.benchmark executor
+#   python3 -m voiceCommand.benchmark wake --model /usr/share/vosk/models/vosk-model-en-us-0.22 idle.wav wake.wav
+#   python3 -m voiceCommand.benchmark streams --model /usr/share/vosk/models/vosk-model-en-us-0.22 --workers 1 2 4 *.wav
+#   python3 -m voiceCommand.benchmark toggle --toggles 2000
+#   python3 -m voiceCommand.benchmark resample --model /usr/share/vosk/models/vosk-model-en-us-0.22 48k.wav
+#   python3 -m voiceCommand.benchmark sysinfo
+#   python3 -m voiceCommand.benchmark volume --bursts 1 3 10
+#   python3 -m voiceCommand.benchmark files --files 1000000 --tree /var/tmp/synthetic-tree
+#   python3 -m voiceCommand.benchmark startup
+
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+
+from voiceCommand.audioRingBuffer import AudioRingBuffer
+from voiceCommand.commandExecutor import CommandExecutor
+from voiceCommand.commandMatcher import Command, CommandMatcher, Match
+from voiceCommand.commandTable import COMMANDS
+from voiceCommand.fileIndex import FileTable
+from voiceCommand.grammarRecognizer import GrammarRecognizer
+from voiceCommand.mixer import FakeMixer, VolumeControl
+from voiceCommand.systemInfo import SystemInfo
+from voiceCommand.wavFiles import readWavBlocks
+
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel",
+         "india", "juliet", "kilo", "lima", "mike", "november", "oscar", "papa"]
+
+
+def syntheticCommands(count, rng):
+    commands = []
+    for index in range(count):
+        phrase = f"custom {rng.choice(WORDS)} {rng.choice(WORDS)} {index}"
+        commands.append(Command(phrase, [phrase], argv=["true"]))
+    return commands
+
+
+def linearMatch(commands, transcript):
+    # What the old elif chain did: substring tests in declaration order
+    for command in commands:
+        for phrase in command.phrases:
+            if phrase in transcript:
+                return command
+    return None
+
+
+def timePerCall(function, transcripts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for transcript in transcripts:
+            function(transcript)
+    return (time.perf_counter() - start) / (repeat * len(transcripts))
+
+
+def benchmarkDispatch(args):
+    rng = random.Random(0)
+    print(f"{'commands':>10} {'matcher us':>12} {'linear us':>12} {'fuzzy us':>12} {'fuzzy hits':>11}")
+    for extra in args.sizes:
+        commands = COMMANDS + syntheticCommands(extra, rng)
+        matcher = CommandMatcher(commands)
+        # Mix of real commands, late custom commands and misses
+        transcripts = [f"please {rng.choice(command.phrases)} now" for command in rng.choices(commands, k=50)]
+        transcripts += ["what is the update on the sleeping dog"] * 10
+        perMatch = timePerCall(matcher.match, transcripts, args.repeat)
+        perLinear = timePerCall(lambda transcript: linearMatch(commands, transcript), transcripts, args.repeat)
+        # Built-in phrases with one letter misheard, which only the fuzzy lookup can match
+        misheard = {}
+        for command in rng.choices([command for command in COMMANDS if command.fuzzy], k=50):
+            phrase = rng.choice(command.phrases)
+            position = rng.randrange(len(phrase))
+            misheard[phrase[:position] + rng.choice("aeiou") + phrase[position + 1:]] = command
+        perFuzzy = timePerCall(lambda transcript: matcher.match(transcript, 0.8), list(misheard), args.repeat // 10)
+        hits = sum(getattr(matcher.match(text, 0.8), "command", None) is command
+                   for text, command in misheard.items())
+        print(f"{len(commands):>10} {perMatch * 1e6:>12.2f} {perLinear * 1e6:>12.2f} {perFuzzy * 1e6:>12.2f} "
+              f"{f'{hits}/{len(misheard)}':>11}")
+
+
+def decodeBlocks(recognizer, blocks, samplerate):
+    # Returns (texts, end-of-utterance latencies): how much audio had to be fed
+    # after the last word ended before the recognizer declared the utterance over
+    texts, latencies = [], []
+    fed = 0.0
+
+    def collect(result):
+        result = json.loads(result)
+        if result.get("text"):
+            texts.append(result["text"])
+            if result.get("result"):
+                latencies.append(fed - result["result"][-1]["end"])
+
+    for block in blocks:
+        fed += len(block) / 2 / samplerate
+        if recognizer.AcceptWaveform(block):
+            collect(recognizer.Result())
+    collect(recognizer.FinalResult())
+    return texts, latencies
+
+
+def benchmarkGrammar(args):
+    import vosk
+
+    model = vosk.Model(args.model)
+    matcher = CommandMatcher(COMMANDS)
+    files = [(path,) + readWavBlocks(path) for path in args.wavs]
+    audioSeconds = sum(len(b) for _, _, blocks in files for b in blocks) / 2 / files[0][1]
+
+    print(f"{'mode':>8} {'cpu s/audio s':>14} {'eou latency ms':>15}")
+    for mode in ("full", "grammar"):
+        cpuStart = time.process_time()
+        latencies = []
+        for path, samplerate, blocks in files:
+            def makeRecognizer(grammar):
+                if grammar:
+                    return vosk.KaldiRecognizer(model, samplerate, grammar)
+                return vosk.KaldiRecognizer(model, samplerate)
+
+            if mode == "grammar":
+                recognizer = GrammarRecognizer(makeRecognizer, matcher)
+            else:
+                recognizer = makeRecognizer(None)
+            recognizer.SetWords(True)
+            texts, fileLatencies = decodeBlocks(recognizer, blocks, samplerate)
+            latencies += fileLatencies
+            if args.verbose:
+                print(f"  {mode} {path}: {texts}")
+        cpu = time.process_time() - cpuStart
+        latency = sum(latencies) / len(latencies) * 1000 if latencies else float("nan")
+        print(f"{mode:>8} {cpu / audioSeconds:>14.3f} {latency:>15.0f}")
+
+
+def benchmarkVad(args):
+    import vosk
+
+    from voiceCommand.voiceActivity import VoiceActivityGate
+
+    model = vosk.Model(args.model)
+    print(f"{'file':>24} {'vad':>4} {'cpu s/audio s':>14} {'decoded':>8} {'skipped':>8}  transcript")
+    for path in args.wavs:
+        samplerate, blocks = readWavBlocks(path)
+        audioSeconds = sum(len(block) for block in blocks) / 2 / samplerate
+        for enabled in (False, True):
+            recognizer = vosk.KaldiRecognizer(model, samplerate)
+            gate = VoiceActivityGate(energyThreshold=args.vad_threshold, enabled=enabled)
+            texts = []
+            cpuStart = time.process_time()
+            for block in blocks:
+                for speech in gate.process(block):
+                    if recognizer.AcceptWaveform(speech):
+                        texts.append(json.loads(recognizer.Result()).get("text"))
+                if gate.ended:
+                    texts.append(json.loads(recognizer.FinalResult()).get("text"))
+            texts.append(json.loads(recognizer.FinalResult()).get("text"))
+            cpu = time.process_time() - cpuStart
+            transcript = " | ".join(text for text in texts if text)
+            print(f"{path[-24:]:>24} {'on' if enabled else 'off':>4} {cpu / audioSeconds:>14.3f} "
+                  f"{gate.decodedBlocks:>8} {gate.droppedBlocks:>8}  {transcript}")
+
+
+def benchmarkExecutor(args):
+    # A producer writes blocks into the ring at the microphone's pace while the
+    # consumer "decodes" them and, every few seconds, runs a long command
+    blockFrames, samplerate = 1024, 16000
+    blockSeconds = blockFrames / samplerate
+    slow = Command("slow", ["slow"], argv=["sleep", str(args.command_seconds)])
+
+    print(f"{'mode':>9} {'mean lag ms':>12} {'max lag ms':>11} {'dropped':>8}")
+    for mode in ("inline", "executor"):
+        ring = AudioRingBuffer(blockFrames, samplerate, capacityMs=60000)
+        executor = CommandExecutor()
+        running = True
+
+        def produce():
+            block = bytes(blockFrames * 2)
+            nextTick = time.monotonic()
+            while running:
+                ring.write(block)
+                nextTick += blockSeconds
+                time.sleep(max(0.0, nextTick - time.monotonic()))
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+        lags = []
+        end = time.monotonic() + args.seconds
+        for count in range(10 ** 9):
+            if time.monotonic() > end:
+                break
+            if ring.read(timeout=1.0) is None:
+                continue
+            lags.append(ring.lagMs)
+            if count % int(args.command_every / blockSeconds) == 0:
+                if mode == "inline":
+                    subprocess.run(slow.argvFor(), check=True)
+                else:
+                    executor.submit(Match(slow, "slow", 0, 1, ()))
+        running = False
+        producer.join()
+        executor.shutdown()
+        print(f"{mode:>9} {sum(lags) / len(lags):>12.1f} {max(lags):>11.1f} {ring.droppedBlocks:>8}")
+
+
+def benchmarkResample(args):
+    import vosk
+
+    from voiceCommand.resampler import MODEL_RATE, Resampler
+
+    model = vosk.Model(args.model)
+    print(f"{'file':>24} {'rate':>6} {'resample s/audio s':>19} {'decode s/audio s':>17}  transcript")
+    for path in args.wavs:
+        samplerate, blocks = readWavBlocks(path)
+        audioSeconds = sum(len(block) for block in blocks) / 2 / samplerate
+        runs = [(samplerate, blocks, 0.0)]
+        if samplerate != MODEL_RATE:
+            resampler = Resampler(samplerate, MODEL_RATE)
+            cpuStart = time.process_time()
+            resampled = [resampler.process(block) for block in blocks]
+            runs.append((MODEL_RATE, resampled, time.process_time() - cpuStart))
+        for rate, rateBlocks, resampleCpu in runs:
+            recognizer = vosk.KaldiRecognizer(model, rate)
+            cpuStart = time.process_time()
+            texts, _ = decodeBlocks(recognizer, rateBlocks, rate)
+            cpu = time.process_time() - cpuStart
+            print(f"{path[-24:]:>24} {rate:>6} {resampleCpu / audioSeconds:>19.4f} {cpu / audioSeconds:>17.3f}  "
+                  f"{' | '.join(texts)}")
+
+
+def benchmarkWake(args):
+    import vosk
+
+    from voiceCommand.wakeWord import WakeWordRecognizer
+
+    model = vosk.Model(args.model)
+    spotterGrammar = json.dumps([args.wake_word, "[unk]"])
+    print(f"{'file':>24} {'mode':>6} {'cpu s/audio s':>14} {'wakes':>6} {'wake->cmd ms':>13}  transcript")
+    for path in args.wavs:
+        samplerate, blocks = readWavBlocks(path)
+        audioSeconds = sum(len(block) for block in blocks) / 2 / samplerate
+        for mode in ("always", "wake"):
+            recognizer = vosk.KaldiRecognizer(model, samplerate)
+            if mode == "wake":
+                spotter = vosk.KaldiRecognizer(model, samplerate, spotterGrammar)
+                recognizer = WakeWordRecognizer(spotter, recognizer, args.wake_word, samplerate)
+            cpuStart = time.process_time()
+            texts, _ = decodeBlocks(recognizer, blocks, samplerate)
+            cpu = time.process_time() - cpuStart
+            wakes, latency = "-", "-"
+            if mode == "wake":
+                wakes = recognizer.detections
+                if recognizer.latencies:
+                    latency = f"{sum(recognizer.latencies) / len(recognizer.latencies) * 1000:.0f}"
+            print(f"{path[-24:]:>24} {mode:>6} {cpu / audioSeconds:>14.3f} {wakes:>6} {latency:>13}  "
+                  f"{' | '.join(text for text in texts if text)}")
+
+
+def benchmarkStreams(args):
+    import vosk
+
+    from voiceCommand.recognizerPool import RecognizerPool
+
+    model = vosk.Model(args.model)
+    files = [readWavBlocks(path) for path in args.wavs] * args.copies
+    audioSeconds = sum(len(block) for _, blocks in files for block in blocks) / 2 / files[0][0]
+
+    print(f"{len(files)} streams, {audioSeconds:.0f}s of audio")
+    print(f"{'workers':>8} {'wall s':>8} {'audio s/wall s':>15} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        pool = RecognizerPool(lambda samplerate, grammar: vosk.KaldiRecognizer(model, samplerate), workers)
+        start = time.perf_counter()
+        # every source is queued at once, as if all devices were live
+        streams = [(pool.open(samplerate), blocks) for samplerate, blocks in files]
+        pending = []
+        for stream, blocks in streams:
+            pending += [stream.feed(block) for block in blocks]
+            pending.append(stream.finish())
+        for future in pending:
+            future.result()
+        wall = time.perf_counter() - start
+        for stream, _ in streams:
+            stream.close()
+        pool.shutdown()
+        baseline = baseline or wall
+        print(f"{workers:>8} {wall:>8.2f} {audioSeconds / wall:>15.1f} {baseline / wall:>8.2f}")
+
+
+class CountingPipeline:
+    # The RecordingWorker side of VoicePipeline, without a recognizer behind it
+    def __init__(self, ring):
+        self.ring = ring
+        self.blocks = 0
+        self.resets = 0
+
+    def processBlock(self, data):
+        self.blocks += 1
+
+    def reset(self):
+        self.resets += 1
+
+    def summary(self):
+        return f"{self.blocks} blocks decoded"
+
+
+def benchmarkToggle(args):
+    import contextlib
+    import io
+
+    import sounddevice as sd
+
+    from voiceCommand.recordingWorker import RecordingWorker
+
+    blockFrames = 1024
+    samplerate = int(sd.query_devices(sd.default.device[0], "input")["default_samplerate"])
+
+    def counts():
+        return threading.active_count(), len(os.listdir("/proc/self/fd"))
+
+    print(f"{'mode':>10} {'toggle p50 ms':>14} {'toggle max ms':>14} {'threads':>12} {'fds':>12}")
+    for mode in ("reopen", "worker"):
+        ring = AudioRingBuffer(blockFrames, samplerate)
+        pipeline = CountingPipeline(ring)
+        openStream = lambda: sd.RawInputStream(dtype="int16", channels=1, blocksize=blockFrames,
+                                               samplerate=samplerate, callback=lambda data, *_: ring.write(data))
+        threadsBefore, fdsBefore = counts()
+        toggles = []
+        if mode == "reopen":
+            # What startRecording/stopRecording used to do
+            running = [False]
+
+            def record():
+                # blocks for good once the stream stops, like the old q.get()
+                while running[0]:
+                    ring.read()
+
+            for _ in range(args.toggles):
+                start = time.perf_counter()
+                stream = openStream()
+                stream.start()
+                running[0] = True
+                threading.Thread(target=record, daemon=True).start()
+                toggles.append(time.perf_counter() - start)
+                time.sleep(args.hold)
+                start = time.perf_counter()
+                running[0] = False
+                stream.stop()
+                stream.close()
+                toggles.append(time.perf_counter() - start)
+        else:
+            worker = RecordingWorker(pipeline, openStream)
+            with contextlib.redirect_stdout(io.StringIO()):
+                for _ in range(args.toggles):
+                    worker.resume()
+                    time.sleep(args.hold)
+                    worker.pause()
+            toggles = [ms / 1000 for ms in worker.toggleMs]
+            worker.close()
+        threadsAfter, fdsAfter = counts()
+        toggles.sort()
+        print(f"{mode:>10} {toggles[len(toggles) // 2] * 1000:>14.2f} {toggles[-1] * 1000:>14.2f} "
+              f"{f'{threadsBefore} -> {threadsAfter}':>12} {f'{fdsBefore} -> {fdsAfter}':>12}")
+
+
+def benchmarkSysinfo(args):
+    # the tools the info commands used to run
+    tools = {"cpu": ["top", "-b", "-n", "1"], "memory": ["free", "-h"], "battery": ["acpi", "-b"],
+             "network": ["ip", "-s", "link"]}
+    info = SystemInfo(args.root)
+    print(f"{'provider':>10} {'in-process us':>14} {'fork ms':>10}")
+    for name, argv in tools.items():
+        perQuery = timePerCall(lambda _: info.query(name), [None], args.repeat)
+        try:
+            start = time.perf_counter()
+            for _ in range(args.forks):
+                subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            perFork = f"{(time.perf_counter() - start) / args.forks * 1000:.2f}"
+        except OSError:
+            perFork = "n/a"
+        print(f"{name:>10} {perQuery * 1e6:>14.1f} {perFork:>10}")
+
+
+def benchmarkVolume(args):
+    print(f"{'burst':>6} {'mixer writes':>13} {'per command us':>15} {'amixer fork ms':>15}")
+    for burst in args.bursts:
+        mixer = FakeMixer()
+        control = VolumeControl(mixer, window=args.window)
+        start = time.perf_counter()
+        for _ in range(burst):
+            control.adjust(10)
+        perCommand = (time.perf_counter() - start) / burst
+        time.sleep(args.window * 2)
+        try:
+            # what every "volume up" used to cost
+            start = time.perf_counter()
+            for _ in range(burst):
+                subprocess.run(["amixer", "-D", "pulse", "sget", "Master"], stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+            perFork = f"{(time.perf_counter() - start) / burst * 1000:.2f}"
+        except OSError:
+            perFork = "n/a"
+        print(f"{burst:>6} {len(mixer.writes):>13} {perCommand * 1e6:>15.1f} {perFork:>15}")
+
+
+def syntheticTree(root, files, perDirectory, rng):
+    # word-word-number.ext names, nested two levels deep; reused if it is already there
+    if os.path.isdir(root) and os.listdir(root):
+        return
+    for start in range(0, files, perDirectory):
+        directory = os.path.join(root, f"d{start // perDirectory // 100}", f"d{start // perDirectory}")
+        os.makedirs(directory)
+        for index in range(start, min(start + perDirectory, files)):
+            name = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{index}.{rng.choice(['txt', 'pdf', 'png', 'py'])}"
+            open(os.path.join(directory, name), "w").close()
+
+
+def benchmarkFiles(args):
+    import tempfile
+
+    from voiceCommand.modelLifecycle import formatBytes, residentSetSize
+
+    rng = random.Random(0)
+    print(f"Creating {args.files} files in {args.tree}...")
+    syntheticTree(args.tree, args.files, args.per_directory, rng)
+
+    rssBefore = residentSetSize()
+    start = time.perf_counter()
+    table = FileTable.scan([args.tree])
+    build = time.perf_counter() - start
+    memory = residentSetSize() - rssBefore
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "files.idx.gz")
+        table.save(path)
+        size = os.path.getsize(path)
+        start = time.perf_counter()
+        FileTable.load(path)
+        load = time.perf_counter() - start
+    print(f"{len(table)} names: scan {build:.1f}s, load {load:.1f}s, {formatBytes(memory)} resident, "
+          f"{formatBytes(size)} on disk")
+
+    samples = rng.sample(range(len(table)), 20)
+    queries = {"exact": [table.names[index] for index in samples],
+               "prefix": [table.names[index].split("-")[0] + "-" + table.names[index].split("-")[1][:2]
+                          for index in samples],
+               "fuzzy": [table.names[index].replace("-", " ").rsplit(".", 1)[0] for index in samples]}
+    print(f"{'lookup':>8} {'p50 ms':>9} {'max ms':>9} {'hits':>8}")
+    for mode, texts in queries.items():
+        times, hits = [], 0
+        for text in texts:
+            start = time.perf_counter()
+            hits += sum(1 for _ in itertools.islice(getattr(table, mode)(text), 20))
+            times.append(time.perf_counter() - start)
+        times.sort()
+        print(f"{mode:>8} {times[len(times) // 2] * 1000:>9.2f} {times[-1] * 1000:>9.2f} {hits / len(texts):>8.1f}")
+
+    start = time.perf_counter()
+    for text in queries["exact"][:args.finds]:
+        subprocess.run(["find", args.tree, "-name", text], stdout=subprocess.DEVNULL)
+    print(f"{'find':>8} {(time.perf_counter() - start) / args.finds * 1000:>9.2f}")
+
+
+# Top-level packages behind each part of the start-up cost
+IMPORT_GROUPS = {"engine": ["voiceCommand"],
+                 "audio": ["sounddevice", "_sounddevice", "cffi", "_cffi_backend", "numpy"],
+                 "tkinter": ["tkinter", "_tkinter"], "pystray/PIL": ["pystray", "PIL", "Xlib", "gi", "six"]}
+
+
+def importTimes(modules, missing):
+    """Self time in seconds per top-level package, from python -X importtime."""
+    statement = ("import sys\n"
+                 f"for name in {modules!r}:\n"
+                 "    try:\n"
+                 "        __import__(name)\n"
+                 "    except ImportError as e:\n"
+                 "        print('missing:', e, file=sys.stderr)\n")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], stderr=subprocess.PIPE,
+                            text=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("missing:"):
+            missing.add(line[len("missing: "):])
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, selfTime, _, name = re.split(r"\s*\|\s*|:\s+", line, maxsplit=3)
+        root = name.strip().split(".")[0]
+        times[root] = times.get(root, 0) + int(selfTime) / 1e6
+    return times
+
+
+def benchmarkStartup(args):
+    runs = {"tk": ["voiceCommand.__main__", "voiceCommand.tkFrontend", "sounddevice"],
+            "tray": ["voiceCommand.__main__", "voiceCommand.trayFrontend", "sounddevice"],
+            # one module importing every toolkit up front
+            "eager": ["voiceCommand.__main__", "voiceCommand.tkFrontend", "voiceCommand.trayFrontend", "sounddevice"]}
+    results = {}
+    missing = set()
+    for name, modules in runs.items():
+        samples = [importTimes(modules, missing) for _ in range(args.repeat)]
+        results[name] = min(samples, key=lambda sample: sum(sample.values()))
+    for error in sorted(missing):
+        print(f"Not installed, left out: {error}")
+    groups = {name: {group: sum(times.get(root, 0) for root in roots) * 1000
+                     for group, roots in IMPORT_GROUPS.items()}
+              for name, times in results.items()}
+    # what a front-end saves is the other toolkit, as measured when everything is imported
+    toolkits = {"tk": "tkinter", "tray": "pystray/PIL"}
+    print(f"{'front-end':>10} {'total ms':>9} " + " ".join(f"{group:>12}" for group in IMPORT_GROUPS) +
+          f" {'saved ms':>9}")
+    for name, times in results.items():
+        saved = sum(groups["eager"][toolkit] for frontend, toolkit in toolkits.items() if frontend != name)
+        if name == "eager":
+            saved = 0.0
+        print(f"{name:>10} {sum(times.values()) * 1000:>9.1f} " +
+              " ".join(f"{ms:>12.1f}" for ms in groups[name].values()) + f" {saved:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice command engine benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    dispatch = subparsers.add_parser("dispatch", help="command matcher cost vs. command table size")
+    dispatch.add_argument("--sizes", type=int, nargs="+", default=[0, 100, 500, 1000, 5000])
+    dispatch.add_argument("--repeat", type=int, default=200)
+    dispatch.set_defaults(run=benchmarkDispatch)
+
+    grammar = subparsers.add_parser("grammar", help="full vocabulary vs. grammar-constrained decoding")
+    grammar.add_argument("--model", required=True, help="path to the Vosk model directory")
+    grammar.add_argument("--verbose", action="store_true", help="print the transcripts")
+    grammar.add_argument("wavs", nargs="+", help="16-bit mono WAV recordings of commands")
+    grammar.set_defaults(run=benchmarkGrammar)
+
+    vad = subparsers.add_parser("vad", help="decode CPU with and without the voice-activity gate")
+    vad.add_argument("--model", required=True, help="path to the Vosk model directory")
+    vad.add_argument("--vad-threshold", type=float, default=300.0)
+    vad.add_argument("wavs", nargs="+", help="16-bit mono WAV recordings, e.g. an idle room and speech")
+    vad.set_defaults(run=benchmarkVad)
+
+    executorBenchmark = subparsers.add_parser("executor", help="audio lag while long commands run")
+    executorBenchmark.add_argument("--seconds", type=float, default=10.0, help="length of each run")
+    executorBenchmark.add_argument("--command-seconds", type=float, default=3.0, help="how long each command runs")
+    executorBenchmark.add_argument("--command-every", type=float, default=2.0, help="seconds between commands")
+    executorBenchmark.set_defaults(run=benchmarkExecutor)
+
+    wake = subparsers.add_parser("wake", help="decode CPU of the always-on recognizer vs. the wake word spotter")
+    wake.add_argument("--model", required=True, help="path to the Vosk model directory")
+    wake.add_argument("--wake-word", default="hey computer")
+    wake.add_argument("wavs", nargs="+", help="16-bit mono WAV recordings, e.g. an idle room and "
+                                              "'hey computer, open firefox'")
+    wake.set_defaults(run=benchmarkWake)
+
+    streams = subparsers.add_parser("streams", help="multi-stream throughput of the shared-model recognizer pool")
+    streams.add_argument("--model", required=True, help="path to the Vosk model directory")
+    streams.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    streams.add_argument("--copies", type=int, default=1, help="decode every file this many times")
+    streams.add_argument("wavs", nargs="+", help="16-bit mono WAV recordings, one stream each")
+    streams.set_defaults(run=benchmarkStreams)
+
+    toggle = subparsers.add_parser("toggle", help="mic toggle latency and thread/fd counts over many toggles")
+    toggle.add_argument("--toggles", type=int, default=1000)
+    toggle.add_argument("--hold", type=float, default=0.01, help="seconds the mic stays on per toggle")
+    toggle.set_defaults(run=benchmarkToggle)
+
+    resample = subparsers.add_parser("resample", help="decode CPU at the device rate vs. resampled to 16 kHz")
+    resample.add_argument("--model", required=True, help="path to the Vosk model directory")
+    resample.add_argument("wavs", nargs="+", help="16-bit mono WAV recordings at 44.1 or 48 kHz")
+    resample.set_defaults(run=benchmarkResample)
+
+    sysinfo = subparsers.add_parser("sysinfo", help="in-process /proc and /sys providers vs. forking the tools")
+    sysinfo.add_argument("--root", default="/", help="tree holding proc/ and sys/, e.g. a copied fixture")
+    sysinfo.add_argument("--repeat", type=int, default=1000)
+    sysinfo.add_argument("--forks", type=int, default=20)
+    sysinfo.set_defaults(run=benchmarkSysinfo)
+
+    volume = subparsers.add_parser("volume", help="mixer writes for bursts of volume commands")
+    volume.add_argument("--bursts", type=int, nargs="+", default=[1, 3, 10])
+    volume.add_argument("--window", type=float, default=0.15)
+    volume.set_defaults(run=benchmarkVolume)
+
+    files = subparsers.add_parser("files", help="filename index build, size and lookups vs. find")
+    files.add_argument("--tree", required=True, help="directory for the synthetic tree, reused if it exists")
+    files.add_argument("--files", type=int, default=1000000)
+    files.add_argument("--per-directory", type=int, default=500)
+    files.add_argument("--finds", type=int, default=3, help="how many lookups to time with find")
+    files.set_defaults(run=benchmarkFiles)
+
+    startup = subparsers.add_parser("startup", help="import cost of each front-end vs. importing every toolkit")
+    startup.add_argument("--repeat", type=int, default=5, help="runs per front-end; the fastest is kept")
+    startup.set_defaults(run=benchmarkStartup)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
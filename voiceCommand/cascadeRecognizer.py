@@ -0,0 +1,112 @@
+import collections
+import json
+import sys
+import threading
+
+
+class CascadeRecognizer:
+    """Small model first, large model only when the small one is unsure.
+
+    Every utterance is decoded by the small recognizer with word confidences
+    on, while its audio is kept. When the small model's text matches no
+    command, or its least confident word is below `threshold`, the kept audio
+    is decoded again by the large recognizer and that result is used instead.
+    The large model is loaded on a background thread the first time it is
+    needed; until it is ready the small model's result stands.
+    """
+
+    def __init__(self, smallRecognizer, makeLargeRecognizer, matcher, threshold=0.75, maxUtteranceBlocks=500):
+        self.smallRecognizer = smallRecognizer
+        self.smallRecognizer.SetWords(True)
+        self.makeLargeRecognizer = makeLargeRecognizer
+        self.largeRecognizer = None
+        self.largeLoading = False
+        self.matcher = matcher
+        self.threshold = threshold
+        self.utterance = collections.deque(maxlen=maxUtteranceBlocks)
+        self.result = "{}"
+
+        self.utterances = 0
+        self.escalations = 0
+        self.corrections = 0
+        self.unavailable = 0
+
+    def SetWords(self, words):
+        # the small model always needs word confidences to decide on escalation
+        pass
+
+    def setMatcher(self, matcher):
+        self.matcher = matcher
+        if hasattr(self.smallRecognizer, "setMatcher"):
+            self.smallRecognizer.setMatcher(matcher)
+
+    def _confident(self, result):
+        text = result.get("text")
+        if self.matcher.match(text) is None:
+            return False
+        return min((word["conf"] for word in result.get("result", [])), default=1.0) >= self.threshold
+
+    def _loadLarge(self):
+        try:
+            recognizer = self.makeLargeRecognizer()
+            recognizer.SetWords(False)
+            self.largeRecognizer = recognizer
+            print("===> Large model ready for escalation")
+        except Exception as e:
+            print(f"Could not load the large model: {e}", file=sys.stderr)
+
+    def _escalate(self):
+        if self.largeRecognizer is None:
+            if not self.largeLoading:
+                self.largeLoading = True
+                threading.Thread(target=self._loadLarge, daemon=True).start()
+            self.unavailable += 1
+            return None
+        self.escalations += 1
+        texts = []
+        for block in self.utterance:
+            if self.largeRecognizer.AcceptWaveform(block):
+                texts.append(json.loads(self.largeRecognizer.Result()).get("text", ""))
+        texts.append(json.loads(self.largeRecognizer.FinalResult()).get("text", ""))
+        return " ".join(text for text in texts if text)
+
+    def _endUtterance(self, result):
+        parsed = json.loads(result)
+        self.result = result
+        if parsed.get("text"):
+            self.utterances += 1
+            if not self._confident(parsed):
+                text = self._escalate()
+                if text is not None:
+                    if text != parsed["text"]:
+                        self.corrections += 1
+                    self.result = json.dumps({"text": text})
+        self.utterance.clear()
+        return True
+
+    def AcceptWaveform(self, data):
+        self.utterance.append(data)
+        if self.smallRecognizer.AcceptWaveform(data):
+            return self._endUtterance(self.smallRecognizer.Result())
+        return False
+
+    def Result(self):
+        return self.result
+
+    def PartialResult(self):
+        return self.smallRecognizer.PartialResult()
+
+    def FinalResult(self):
+        self._endUtterance(self.smallRecognizer.FinalResult())
+        return self.result
+
+    def Reset(self):
+        self.smallRecognizer.Reset()
+        if self.largeRecognizer:
+            self.largeRecognizer.Reset()
+        self.utterance.clear()
+
+    def summary(self):
+        rate = 100.0 * self.escalations / self.utterances if self.utterances else 0.0
+        return (f"Cascade: {self.escalations}/{self.utterances} utterances escalated to the large model "
+                f"({rate:.0f}%), {self.corrections} changed, {self.unavailable} while it was loading")
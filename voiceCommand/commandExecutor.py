@@ -0,0 +1,265 @@
+import collections
+import heapq
+import itertools
+import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from voiceCommand.commandMatcher import PRIORITIES
+from voiceCommand.resultCache import ResultCache
+
+# How many jobs of each priority class may run at once
+LIMITS = {"urgent": 4, "normal": 2, "slow": 1}
+
+
+class Job:
+    def __init__(self, number, command, args, trace):
+        self.number = number
+        self.command = command
+        self.args = args
+        self.trace = trace
+        self.state = "queued"
+        self.process = None
+        self.queuedAt = time.monotonic()
+        self.startedAt = None
+
+    def describe(self):
+        since = self.startedAt or self.queuedAt
+        return (f"#{self.number} {self.command.name} ({self.command.priority}, {self.state} "
+                f"{time.monotonic() - since:.0f}s)")
+
+
+class CommandExecutor:
+    """Schedules matched commands without ever blocking the recognition thread.
+
+    GUI launches (commands marked `detach`) are started in a new session with
+    Popen and left running; a reaper thread collects their exit status.
+    Everything else is queued by priority class and started as soon as its
+    class is below its concurrency limit, so a slow "weather" fetch never holds
+    up "lock screen". Jobs run in their own process group with a wall-clock
+    timeout, and cancel() kills the group of the newest running job. Output
+    of commands with a `cache` TTL is captured and answered from a
+    ResultCache without forking while it lasts.
+    """
+
+    def __init__(self, limits=None, reapInterval=1.0):
+        self.limits = dict(LIMITS, **(limits or {}))
+        self.pool = ThreadPoolExecutor(max_workers=sum(self.limits.values()), thread_name_prefix="command")
+        self.queue = []
+        self.running = {priority: [] for priority in PRIORITIES}
+        self.finished = collections.deque(maxlen=10)
+        self.numbers = itertools.count(1)
+        self.cache = ResultCache()
+        self.lock = threading.Lock()
+        self.reapInterval = reapInterval
+        self.detached = []
+        self.detachedLock = threading.Lock()
+        self.exitStatuses = collections.deque(maxlen=50)
+        self.reaper = None
+
+    def submit(self, match, trace=None):
+        command, args = match.command, match.args
+        if command.pattern and not args:
+            print(command.missing or "No argument detected.")
+            self._finish(trace, command)
+            return None
+        if command.cache and command.argv:
+            argv = command.argvFor(args)
+            output = self.cache.lookup(tuple(argv), command.cache, lambda: self._capture(command, argv))
+            if output is not None:
+                print(output, end="")
+                self._finish(trace, command)
+                return None
+        if command.detach and command.argv:
+            self._launch(command, args, trace)
+            return None
+        job = Job(next(self.numbers), command, args, trace)
+        with self.lock:
+            heapq.heappush(self.queue, (PRIORITIES.index(command.priority), job.number, job))
+            self._dispatch()
+        return job
+
+    def _dispatch(self):
+        # Called with the lock held: start every queued job whose class has room
+        waiting = []
+        while self.queue:
+            entry = heapq.heappop(self.queue)
+            job = entry[2]
+            running = self.running[job.command.priority]
+            if len(running) < self.limits[job.command.priority]:
+                job.state = "running"
+                job.startedAt = time.monotonic()
+                running.append(job)
+                self.pool.submit(self._run, job)
+            else:
+                waiting.append(entry)
+        for entry in waiting:
+            heapq.heappush(self.queue, entry)
+
+    def cancel(self):
+        """Kill the newest running job's process group, or drop the newest queued job."""
+        with self.lock:
+            running = [job for jobs in self.running.values() for job in jobs if job.process]
+            if running:
+                job = max(running, key=lambda job: job.startedAt)
+                job.state = "cancelled"
+            elif self.queue:
+                entry = max(self.queue, key=lambda entry: entry[1])
+                self.queue.remove(entry)
+                heapq.heapify(self.queue)
+                job = entry[2]
+                job.state = "cancelled"
+                self.finished.append(job)
+                print(f"Cancelled {job.describe()}")
+                self._finish(job.trace, job.command)
+                return job
+            else:
+                print("Nothing to cancel.")
+                return None
+        print(f"Cancelling {job.describe()}")
+        self._killGroup(job.process, signal.SIGTERM)
+        return job
+
+    def status(self):
+        with self.lock:
+            running = [job for jobs in self.running.values() for job in jobs]
+            queued = [entry[2] for entry in sorted(self.queue)]
+            finished = list(self.finished)
+        lines = ["Jobs:"]
+        lines += [f"  running {job.describe()}" for job in running]
+        lines += [f"  queued  {job.describe()}" for job in queued]
+        lines += [f"  done    {job.describe()}" for job in finished[-3:]]
+        if len(lines) == 1:
+            lines.append("  none")
+        lines.append(self.cache.summary())
+        return "\n".join(lines)
+
+    def _killGroup(self, process, sig):
+        try:
+            os.killpg(process.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    def _finish(self, trace, command):
+        if trace:
+            trace.finish(command.name)
+
+    def _launch(self, command, args, trace):
+        try:
+            process = subprocess.Popen(command.argvFor(args), stdin=subprocess.DEVNULL, start_new_session=True)
+        except OSError as e:
+            print(f"Error executing command: {e}")
+            return
+        finally:
+            if trace:
+                trace.mark("spawned")
+        self._finish(trace, command)
+        if command.message:
+            print(command.message.format(*args))
+        with self.detachedLock:
+            self.detached.append((command.name, process))
+            if self.reaper is None:
+                self.reaper = threading.Thread(target=self._reap, daemon=True)
+                self.reaper.start()
+
+    def _reap(self):
+        while True:
+            time.sleep(self.reapInterval)
+            with self.detachedLock:
+                running = []
+                for name, process in self.detached:
+                    if process.poll() is None:
+                        running.append((name, process))
+                    else:
+                        self.exitStatuses.append((name, process.returncode))
+                        print(f"'{name}' exited with status {process.returncode}")
+                self.detached = running
+
+    def _run(self, job):
+        command, args, trace = job.command, job.args, job.trace
+        try:
+            if command.handler:
+                command.handler(*args)
+            elif command.argv:
+                argv = command.argvFor(args)
+                # its own process group, so a timeout or "cancel" also stops its children
+                job.process = subprocess.Popen(argv, start_new_session=True, text=True,
+                                               stdout=subprocess.PIPE if command.cache else None)
+                if trace:
+                    trace.mark("spawned")
+                try:
+                    output, _ = job.process.communicate(timeout=command.timeout)
+                except subprocess.TimeoutExpired:
+                    self._killGroup(job.process, signal.SIGKILL)
+                    job.process.communicate()
+                    raise
+                if trace:
+                    trace.mark("exited")
+                if job.state == "cancelled":
+                    print(f"Cancelled: {command.name}")
+                    return
+                if command.check and job.process.returncode:
+                    raise subprocess.CalledProcessError(job.process.returncode, argv)
+                if command.cache:
+                    self.cache.store(tuple(argv), output)
+                    print(output, end="")
+            if command.message:
+                print(command.message.format(*args))
+        except subprocess.TimeoutExpired:
+            job.state = "timed out"
+            print(f"Command timed out after {command.timeout}s: {command.name}")
+        except (subprocess.CalledProcessError, OSError) as e:
+            job.state = "failed"
+            print(f"Error executing command: {e}")
+        except Exception as e:
+            job.state = "failed"
+            print(f"An unexpected error occurred: {e}")
+        finally:
+            if job.state == "running":
+                job.state = "done"
+            with self.lock:
+                self.running[command.priority].remove(job)
+                self.finished.append(job)
+                self._dispatch()
+            self._finish(trace, command)
+
+    def _capture(self, command, argv):
+        # background refresh of a cached status command
+        return subprocess.run(argv, stdout=subprocess.PIPE, text=True, timeout=command.timeout,
+                              check=command.check, start_new_session=True).stdout
+
+    def shutdown(self):
+        # jobs only reach the pool when a worker is free, so dropping the queue cancels everything pending
+        with self.lock:
+            for entry in self.queue:
+                entry[2].state = "cancelled"
+            self.queue.clear()
+            self.pool.shutdown(wait=False)
+
+
+class DryRunExecutor:
+    """Stands in for CommandExecutor and records the actions instead of running them."""
+
+    def __init__(self):
+        self.actions = []
+
+    def submit(self, match, trace=None):
+        command, args = match.command, match.args
+        argv = command.argvFor(args) if command.argv and (args or not command.pattern) else None
+        self.actions.append({"command": command.name, "argv": argv})
+        if trace:
+            trace.mark("spawned")
+            trace.finish(command.name)
+        return None
+
+    def cancel(self):
+        self.actions.append({"command": "cancel", "argv": None})
+
+    def status(self):
+        return "Jobs: dry run"
+
+    def shutdown(self):
+        pass
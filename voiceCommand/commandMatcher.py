@@ -0,0 +1,161 @@
+import re
+from collections import deque
+
+from voiceCommand.fuzzyMatcher import PhraseIndex
+
+# Scheduling classes, most urgent first
+PRIORITIES = ("urgent", "normal", "slow")
+
+
+class Command:
+    """A voice command: its trigger phrases and what to run when it is heard."""
+
+    def __init__(self, name, phrases, argv=None, pattern=None, message=None,
+                 missing=None, check=True, handler=None, early=False, detach=False, timeout=10,
+                 priority="normal", cache=None, fuzzy=True):
+        self.name = name
+        # an empty phrase would match every transcript
+        if (isinstance(phrases, str) or not phrases
+                or not all(isinstance(phrase, str) and phrase.strip() for phrase in phrases)):
+            raise ValueError(f"{name!r}: phrases must be a non-empty list of non-blank strings")
+        self.phrases = list(phrases)
+        self.argv = argv
+        # Argument pattern is matched against the words following the trigger
+        # phrase, compiled once here instead of on every transcript
+        self.pattern = re.compile(pattern) if pattern else None
+        self.message = message
+        self.missing = missing
+        self.check = check
+        self.handler = handler
+        # Safe to fire from a partial result, before the utterance is over
+        self.early = early
+        # GUI applications are launched and left running; anything else must
+        # finish within timeout seconds, or may run as long as it needs with None
+        # (file operations, which a kill would leave half done)
+        self.detach = detach
+        self.timeout = timeout
+        if priority not in PRIORITIES:
+            raise ValueError(f"{name!r}: priority must be one of {PRIORITIES}, not {priority!r}")
+        self.priority = priority
+        # Status commands: seconds their output may be answered from the cache
+        self.cache = cache
+        # May be triggered by a transcript that only resembles a phrase
+        self.fuzzy = fuzzy
+
+    def argvFor(self, args=()):
+        """The argv to run, filled in with the arguments captured from the transcript."""
+        return [part.format(*args) for part in self.argv]
+
+
+class Match:
+    def __init__(self, command, phrase, start, end, args, score=1.0):
+        self.command = command
+        self.phrase = phrase
+        self.start = start
+        self.end = end
+        self.args = args
+        # 1.0 for a phrase heard word for word, lower for an approximate match
+        self.score = score
+
+    @property
+    def length(self):
+        return self.end - self.start
+
+
+class CommandMatcher:
+    """Aho-Corasick automaton over the words of every trigger phrase.
+
+    A transcript is scanned once, left to right, and the longest phrase
+    heard wins (ties go to the one spoken first), so "shut down" beats
+    "down" and "date" never fires inside "update". When no phrase is heard
+    exactly and a threshold is given, the closest phrase of a command marked
+    `fuzzy` is looked up in a trigram index instead.
+    """
+
+    def __init__(self, commands):
+        self.commands = list(commands)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for command in self.commands:
+            for phrase in command.phrases:
+                words = phrase.lower().split()
+                node = 0
+                for word in words:
+                    nextNode = self._goto[node].get(word)
+                    if nextNode is None:
+                        nextNode = len(self._goto)
+                        self._goto[node][word] = nextNode
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append([])
+                    node = nextNode
+                self._out[node].append((len(words), command, phrase))
+
+        # Breadth-first pass to build the failure links, merging the outputs
+        # of each node's suffix so a match needs no backtracking
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for word, child in self._goto[node].items():
+                pending.append(child)
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(word, 0)
+                self._out[child].extend(self._out[self._fail[child]])
+
+        # Longest phrase first so the first output at a node is its best one
+        for outputs in self._out:
+            outputs.sort(key=lambda output: -output[0])
+
+        self._fuzzy = PhraseIndex((phrase, command) for command in self.commands if command.fuzzy
+                                  for phrase in command.phrases)
+
+    def phrases(self):
+        return [phrase for command in self.commands for phrase in command.phrases]
+
+    def extendable(self, phrase):
+        """True if some longer trigger phrase starts with this one."""
+        node = 0
+        for word in phrase.lower().split():
+            node = self._goto[node].get(word)
+            if node is None:
+                return False
+        return bool(self._goto[node])
+
+    def match(self, transcript, threshold=None):
+        """Return the most specific Match in the transcript, or None.
+
+        With a threshold, a transcript with no exact phrase may still match
+        a phrase it resembles with at least that score.
+        """
+        words = transcript.lower().split()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        best = None
+        for index, word in enumerate(words):
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            if out[node]:
+                length, command, phrase = out[node][0]
+                if best is None or length > best[0]:
+                    best = (length, index + 1 - length, command, phrase)
+
+        score = 1.0
+        if best is None:
+            closest = self._fuzzy.best(words, threshold) if threshold is not None else None
+            if closest is None:
+                return None
+            score, start, end, phrase, command = closest
+        else:
+            length, start, command, phrase = best
+            end = start + length
+        args = ()
+        if command.pattern:
+            argument = command.pattern.fullmatch(" ".join(words[end:]))
+            if argument:
+                args = argument.groups()
+        return Match(command, phrase, start, end, args, score)
@@ -0,0 +1,123 @@
+# Command table loaded from a JSON file and reloaded when the file changes.
+#
+#   python3 -m voiceCommand.commandRegistry > ~/.config/voiceCommand/commands.json
+#
+# writes the built-in table as a starting point. Each entry takes the keyword
+# arguments of Command, e.g.
+#
+#   {"name": "search google", "phrases": ["search google"], "pattern": "(.+)",
+#    "argv": ["firefox", "https://www.google.com/search?q={0}"], "detach": true}
+#
+# "handler" names one of the Python functions in HANDLERS instead of an argv.
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+from voiceCommand.commandMatcher import Command, CommandMatcher
+from voiceCommand.commandTable import (COMMANDS, maxVolume, muteVolume, searchFile, showBattery, showCpu,
+                                       showDate, showMemory, showNetwork, volumeDown, volumeUp)
+
+HANDLERS = {"showDate": showDate, "showBattery": showBattery, "showCpu": showCpu, "showMemory": showMemory,
+            "showNetwork": showNetwork, "volumeUp": volumeUp, "volumeDown": volumeDown, "muteVolume": muteVolume,
+            "maxVolume": maxVolume, "searchFile": searchFile}
+FIELDS = ("name", "phrases", "argv", "pattern", "message", "missing", "check", "handler", "early", "detach",
+          "timeout", "priority", "cache", "fuzzy")
+
+
+def commandFromDict(entry):
+    unknown = set(entry) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"{entry.get('name')!r}: unknown keys {sorted(unknown)}")
+    entry = dict(entry)
+    if "handler" in entry:
+        if entry["handler"] not in HANDLERS:
+            raise ValueError(f"{entry.get('name')!r}: no handler named {entry['handler']!r}")
+        entry["handler"] = HANDLERS[entry["handler"]]
+    return Command(**entry)
+
+
+def commandToDict(command):
+    entry = {"name": command.name, "phrases": command.phrases}
+    defaults = Command("", ["defaults"])
+    for field in FIELDS[2:]:
+        value = getattr(command, field)
+        if field == "pattern" and value is not None:
+            value = value.pattern
+        elif field == "handler" and value is not None:
+            value = value.__name__
+        if value != getattr(defaults, field):
+            entry[field] = value
+    return entry
+
+
+def loadCommands(path):
+    with open(path) as commandFile:
+        entries = json.load(commandFile)
+    if isinstance(entries, dict):
+        entries = entries["commands"]
+    return [commandFromDict(entry) for entry in entries]
+
+
+class CommandRegistry:
+    """Owns the compiled command table and swaps in a new one when the file changes.
+
+    The watcher thread polls the file's mtime and size, and parses and
+    compiles the new table on its own thread. The recognition thread only ever
+    sees a complete matcher: the swap is a single reference assignment, so no
+    audio is held up while a reload runs. A file that fails to load is
+    reported and the previous table stays in use.
+    """
+
+    def __init__(self, path=None, pollInterval=1.0, onReload=None):
+        self.path = path
+        self.pollInterval = pollInterval
+        self.onReload = onReload
+        self.stamp = None
+        self.reloads = 0
+        self.matcher = CommandMatcher(COMMANDS)
+        if path:
+            self.stamp = self._stamp()
+            self.matcher = CommandMatcher(loadCommands(path))
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self):
+        if self.path:
+            threading.Thread(target=self._watch, daemon=True, name="command-registry").start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.pollInterval)
+            stamp = self._stamp()
+            if stamp is not None and stamp != self.stamp:
+                self.stamp = stamp
+                self.reload()
+
+    def reload(self):
+        start = time.perf_counter()
+        try:
+            matcher = CommandMatcher(loadCommands(self.path))
+        except (OSError, ValueError, TypeError, KeyError, re.error) as e:
+            print(f"Keeping the current commands, could not load {self.path}: {e}", file=sys.stderr)
+            return False
+        self.matcher = matcher
+        self.reloads += 1
+        if self.onReload:
+            self.onReload(matcher)
+        print(f"===> Reloaded {len(matcher.commands)} commands from {self.path} "
+              f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return True
+
+
+if __name__ == "__main__":
+    json.dump([commandToDict(command) for command in COMMANDS], sys.stdout, indent=2)
+    print()
@@ -0,0 +1,157 @@
+import datetime
+
+from voiceCommand.commandMatcher import Command
+from voiceCommand.fileIndex import FILE_INDEX
+from voiceCommand.mixer import VOLUME
+from voiceCommand.systemInfo import SYSTEM_INFO
+
+
+def showDate():
+    now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(f"Current date and time: {now}")
+
+
+def showBattery():
+    print(SYSTEM_INFO.describe("battery"))
+
+
+def showCpu():
+    print(SYSTEM_INFO.describe("cpu"))
+
+
+def showMemory():
+    print(SYSTEM_INFO.describe("memory"))
+
+
+def showNetwork():
+    print(SYSTEM_INFO.describe("network"))
+
+
+def searchFile(name):
+    paths = FILE_INDEX.search(name)
+    if paths is None:
+        print("The file index is still being built, try again in a moment.")
+    elif not paths:
+        print(f"No file matching '{name}' found.")
+    else:
+        print("\n".join(paths))
+
+
+def volumeUp():
+    VOLUME.adjust(10)
+
+
+def volumeDown():
+    VOLUME.adjust(-10)
+
+
+def muteVolume():
+    VOLUME.setLevel(0)
+
+
+def maxVolume():
+    VOLUME.setLevel(100)
+
+
+COMMANDS = [
+    # Open applications
+    Command("open firefox", ["open firefox"], argv=["firefox"], message="Opening Firefox browser...", detach=True),
+    Command("open chrome", ["open chrome"], argv=["google-chrome"], message="Opening Chrome browser...", detach=True),
+    Command("open vscode", ["open visual studio code", "open vscode", "open vs code"], argv=["code"], detach=True),
+    Command("open rhythmbox", ["open rhythmbox", "open rhythm box"], argv=["rhythmbox"], detach=True),
+    Command("open clip history", ["open clip history"], argv=["python3", "/opt/clipHistory/clipHistory.py"],
+            detach=True),
+    Command("open theme switcher", ["open theme switcher"], argv=["python3", "/opt/themeSwitch/themeSwitch.py"],
+            detach=True),
+    Command("open terminal", ["open terminal"], argv=["gnome-terminal"], message="Opening terminal...", detach=True),
+    Command("open text editor", ["open text editor"], argv=["gedit"], message="Opening text editor...", detach=True),
+    Command("open file manager", ["open file manager"], argv=["nautilus"], message="Opening file manager...",
+            detach=True),
+
+    # Basic computer commands, only ever run when heard word for word
+    Command("shutdown", ["shutdown", "shut down"], argv=["shutdown", "now"], message="Shutting down...", fuzzy=False),
+    Command("sleep", ["sleep"], argv=["systemctl", "suspend"], message="Sleeping...", check=False, fuzzy=False),
+    Command("hibernate", ["hibernate"], argv=["systemctl", "hibernate"], message="Hibernating computer...",
+            check=False, fuzzy=False),
+    Command("restart", ["restart"], argv=["reboot"], message="Restarting...", fuzzy=False),
+    Command("lock screen", ["lock screen"], argv=["gnome-screensaver-command", "--lock"],
+            message="Locking screen...", check=False, early=True, priority="urgent"),
+    Command("logout", ["logout", "log out"], argv=["gnome-session-quit", "--logout", "--no-prompt"],
+            message="Logging out...", check=False, fuzzy=False),
+
+    # Volume control, coalesced and written through one mixer connection
+    Command("volume up", ["volume up"], handler=volumeUp, message="Increasing volume...", early=True,
+            priority="urgent"),
+    Command("volume down", ["volume down"], handler=volumeDown, message="Decreasing volume...", early=True,
+            priority="urgent"),
+    Command("mute volume", ["mute volume"], handler=muteVolume, message="Muting volume...", early=True,
+            priority="urgent"),
+    Command("max volume", ["max volume", "full volume"], handler=maxVolume, message="Setting volume to maximum...",
+            early=True, priority="urgent"),
+
+    # System information
+    Command("date", ["date"], handler=showDate),
+    Command("battery status", ["battery status"], handler=showBattery),
+    Command("cpu usage", ["cpu usage"], handler=showCpu),
+    Command("memory usage", ["memory usage"], handler=showMemory),
+
+    # Network commands
+    Command("network status", ["network status"], handler=showNetwork),
+    Command("wifi status", ["wifi status"], argv=["nmcli", "dev", "wifi"], message="Checking WiFi status...",
+            cache=30),
+    Command("connect to wifi", ["connect to wifi"], pattern=r"(.+)",
+            argv=["nmcli", "dev", "wifi", "connect", "{0}"],
+            message="Connecting to WiFi: {0}", missing="No WiFi name detected.", timeout=30, priority="slow"),
+    Command("disconnect wifi", ["disconnect wifi"], argv=["nmcli", "dev", "disconnect"],
+            message="Disconnecting WiFi..."),
+    Command("enable wifi", ["enable wifi"], argv=["nmcli", "radio", "wifi", "on"], message="Enabling WiFi..."),
+    Command("disable wifi", ["disable wifi"], argv=["nmcli", "radio", "wifi", "off"], message="Disabling WiFi..."),
+
+    # File management commands
+    Command("search file", ["search file"], pattern=r"(.+)", handler=searchFile,
+            message="Searched for file: {0}", missing="No file name detected."),
+    Command("create folder", ["create folder"], pattern=r"(.+)", argv=["mkdir", "{0}"],
+            message="Creating folder: {0}", missing="No folder name detected.", timeout=None),
+    Command("delete file", ["delete file"], pattern=r"(.+)", argv=["rm", "{0}"],
+            message="Deleting file: {0}", missing="No file name detected.", fuzzy=False, timeout=None),
+    Command("move file", ["move file"], pattern=r"(.+) to (.+)", argv=["mv", "{0}", "{1}"],
+            message="Moving file: {0} to {1}", missing="No source or destination file path detected.",
+            timeout=None),
+    Command("copy file", ["copy file"], pattern=r"(.+) to (.+)", argv=["cp", "{0}", "{1}"],
+            message="Copying file: {0} to {1}", missing="No source or destination file path detected.",
+            timeout=None),
+    Command("open file", ["open file"], pattern=r"(.+)", argv=["xdg-open", "{0}"],
+            message="Opening file: {0}", missing="No file name detected.", detach=True),
+
+    # Web browsing control
+    Command("search google", ["search google"], pattern=r"(.+)",
+            argv=["firefox", "https://www.google.com/search?q={0}"],
+            message="Searching Google for: {0}", missing="No search query detected.", detach=True),
+
+    # Weather report
+    Command("weather", ["weather", "whether"], argv=["curl", "wttr.in"], message="Fetching weather report...",
+            timeout=15, priority="slow"),
+
+    # Miscellaneous commands
+    Command("take screenshot", ["take screenshot"], argv=["gnome-screenshot"], message="Taking a screenshot...",
+            early=True),
+    Command("open youtube", ["open youtube"], argv=["firefox", "https://www.youtube.com"],
+            message="Opening YouTube...", detach=True),
+    Command("play music", ["play music"], argv=["rhythmbox", "--play"], message="Playing music...", early=True,
+            priority="urgent"),
+    Command("pause music", ["pause music"], argv=["rhythmbox", "--pause"], message="Pausing music...", early=True,
+            priority="urgent"),
+    Command("next track", ["next track"], argv=["rhythmbox", "--next"], message="Skipping to next track...",
+            early=True, priority="urgent"),
+    Command("previous track", ["previous track"], argv=["rhythmbox", "--previous"],
+            message="Going to previous track...", early=True, priority="urgent"),
+    Command("open calculator", ["open calculator"], argv=["gnome-calculator"], message="Opening calculator...",
+            detach=True),
+
+    # Job control, handled by the pipeline's executor
+    Command("cancel", ["cancel", "cancel that", "stop that"]),
+    Command("job status", ["job status", "show jobs"]),
+
+    # Exit voice assistant, handled by the front-end that owns the app
+    Command("exit voice", ["exit voice"]),
+]
@@ -0,0 +1,79 @@
+import time
+
+
+class EarlyDispatcher:
+    """Fires short commands from partial results instead of waiting for the final one.
+
+    A partial result fires when, for `stableBlocks` consecutive blocks, it ends
+    in the same command phrase, the command is marked `early` in the command
+    table, takes no argument, and no longer phrase starts with what was heard.
+    The final result of that utterance is then swallowed, and the time saved
+    against it is recorded per command.
+    """
+
+    def __init__(self, matcher, stableBlocks=3, firedTimeout=5.0):
+        self.matcher = matcher
+        self.stableBlocks = stableBlocks
+        self.firedTimeout = firedTimeout
+        self.candidate = None
+        self.count = 0
+        self.fired = None
+        self.firedAt = 0.0
+        self.savings = {}
+
+    def partial(self, text):
+        """Return the partial text to execute now, or None."""
+        if self.fired and time.monotonic() - self.firedAt > self.firedTimeout:
+            self.fired = None
+        if self.fired or not text:
+            return None
+
+        # the command table may be swapped by a reload at any time
+        matcher = self.matcher
+        match = matcher.match(text)
+        if (match is None or not match.command.early or match.command.pattern
+                or match.end != len(text.split()) or matcher.extendable(match.phrase)):
+            self.candidate = None
+            self.count = 0
+            return None
+
+        if match.command is self.candidate:
+            self.count += 1
+        else:
+            self.candidate = match.command
+            self.count = 1
+        if self.count < self.stableBlocks:
+            return None
+
+        self.fired = match.command
+        self.firedAt = time.monotonic()
+        self.candidate = None
+        self.count = 0
+        return text
+
+    def final(self, text):
+        """Return True if the final result still has to be executed."""
+        fired, self.fired = self.fired, None
+        self.candidate = None
+        self.count = 0
+        if fired is None:
+            return True
+        match = self.matcher.match(text)
+        if match is None or match.command is not fired:
+            return True
+
+        saved = (time.monotonic() - self.firedAt) * 1000
+        self.savings.setdefault(fired.name, []).append(saved)
+        print(f"Early dispatch of '{fired.name}' saved {saved:.0f} ms")
+        return False
+
+    def reset(self):
+        self.candidate = None
+        self.count = 0
+        self.fired = None
+
+    def summary(self):
+        lines = ["Early dispatch savings:"]
+        for name, savings in sorted(self.savings.items()):
+            lines.append(f"  {name}: {len(savings)}x, mean {sum(savings) / len(savings):.0f} ms")
+        return "\n".join(lines)
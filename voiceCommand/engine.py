@@ -0,0 +1,74 @@
+import sys
+
+from voiceCommand.modelLifecycle import chooseModel
+from voiceCommand.pipeline import buildPipeline
+from voiceCommand.recordingWorker import RecordingWorker
+from voiceCommand.resampler import captureRate
+
+BLOCKSIZE = 1024
+
+
+class VoiceEngine:
+    """Microphone, recognition pipeline and recording state, shared by the front-ends.
+
+    A front-end only draws its window or icon and calls toggleRecording()
+    and close(); `onExit` is how "exit voice" reaches it.
+    """
+
+    def __init__(self, args, modelPath, onExit=None):
+        import sounddevice as sd
+
+        # list all audio devices known to your system
+        print("Display input/output devices")
+        print(sd.query_devices())
+
+        # get the samplerate - the capture stage resamples it to the model's 16 kHz
+        device = sd.default.device[0] if args.input_device is None else args.input_device
+        deviceInfo = sd.query_devices(device, "input")
+        samplerate = captureRate(int(deviceInfo["default_samplerate"]), args.capture, device)
+        print("===> Input Device Number:{} Description: {}".format(device, deviceInfo))
+
+        # the model and recognizer objects are built in the background by the loader
+        self.pipeline = buildPipeline(args, chooseModel(modelPath, args.model_variant), samplerate, BLOCKSIZE,
+                                      onExit=lambda: self.onExit and self.onExit())
+        self.onExit = onExit
+        # one stream and one decoding thread, paused and resumed by the mic toggle
+        self.worker = RecordingWorker(self.pipeline, lambda: sd.RawInputStream(
+            dtype="int16", channels=1, callback=self.recordCallback, blocksize=BLOCKSIZE, samplerate=samplerate,
+            device=device))
+        self.is_recording = False
+
+    def recordCallback(self, indata, frames, time, status):
+        # feeds the pipeline's preallocated ring buffer
+        if status:
+            print(status, file=sys.stderr)
+        self.pipeline.capture(indata)
+
+    def start(self):
+        self.pipeline.lifecycle.start()
+
+    def loading(self):
+        return self.pipeline.loader.state in ("idle", "loading")
+
+    def startRecording(self):
+        self.pipeline.lifecycle.recordingStarted()
+        self.is_recording = True
+        self.worker.resume()
+
+    def stopRecording(self):
+        if self.is_recording:
+            self.is_recording = False
+            self.worker.pause()
+            self.pipeline.lifecycle.recordingStopped()
+
+    def toggleRecording(self):
+        print(f"Recording:{self.is_recording}")
+        if self.is_recording:
+            self.stopRecording()
+        else:
+            self.startRecording()
+
+    def close(self):
+        self.stopRecording()
+        self.worker.close()
+        self.pipeline.executor.shutdown()
@@ -0,0 +1,394 @@
+import array
+import bisect
+import collections
+import ctypes
+import gzip
+import itertools
+import os
+import re
+import struct
+import sys
+import threading
+import time
+
+from voiceCommand.fuzzyMatcher import PhraseIndex
+
+DEFAULT_PATH = os.path.expanduser("~/.cache/voiceCommand/files.idx.gz")
+# pseudo filesystems, never worth indexing
+SKIP = ("/proc", "/sys", "/dev", "/run")
+
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+# lowest score of a misheard word in a fuzzy file name lookup
+FUZZY_THRESHOLD = 0.75
+# inotify watches are a per-user budget shared with editors and sync clients:
+# use at most this share of fs.inotify.max_user_watches, and none on bulk trees
+WATCH_SHARE = 0.25
+UNWATCHED = ("node_modules", "__pycache__", "site-packages", "venv", "build", "dist", "target")
+
+
+def watchLimit(path="/proc/sys/fs/inotify/max_user_watches"):
+    try:
+        with open(path) as limitFile:
+            limit = int(limitFile.read())
+    except (OSError, ValueError):
+        limit = 8192
+    return int(limit * WATCH_SHARE)
+
+
+def spokenName(text):
+    """A file name as dictated: "report dot pdf" is report.pdf."""
+    return re.sub(r"\s*\bdot\b\s*", ".", text.strip().lower())
+
+
+def normalize(name):
+    # what is left of a name once case, spaces and punctuation are ignored
+    return re.sub(r"[\W_]+", "", name.lower())
+
+
+def scanTree(root, skip=SKIP):
+    """Yield every directory under root with the names in it, without following links."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        names = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if "\n" in entry.name:
+                        continue
+                    names.append(entry.name)
+                    try:
+                        if entry.is_dir(follow_symlinks=False) and entry.path not in skip:
+                            stack.append(entry.path)
+                    except OSError:
+                        pass
+        except OSError:
+            continue
+        yield directory, names
+
+
+class FileTable:
+    """An immutable snapshot of the index: names sorted case-insensitively.
+
+    Every directory path is stored once and each name keeps only the number
+    of its directory. Exact and prefix lookups bisect the sorted names. Fuzzy
+    lookups look each spoken word up in a trigram index over the words used in
+    names, with a bounded edit distance, and then search one string holding
+    every normalized name, a line each, for those spellings.
+    """
+
+    def __init__(self, dirs, names, parents):
+        order = sorted(range(len(names)), key=lambda index: names[index].lower())
+        self.dirs = dirs
+        self.names = [names[index] for index in order]
+        self.parents = array.array("I", (parents[index] for index in order))
+        # the bisect keys; bisect only takes key= from Python 3.10
+        self.lowered = [name.lower() for name in self.names]
+        keys = [normalize(name) for name in self.names]
+        self.keys = "\n".join(keys) + "\n"
+        self.starts = array.array("Q", itertools.accumulate((len(key) + 1 for key in keys), initial=0))
+        # words of four letters or more; shorter ones allow no edit at the threshold anyway
+        words = set()
+        for name in self.lowered:
+            words.update(re.findall(r"[a-z]{4,}", name))
+        self.vocabulary = PhraseIndex((word, word) for word in words)
+
+    @classmethod
+    def scan(cls, roots, skip=SKIP):
+        dirs, names, parents = [], [], array.array("I")
+        for root in roots:
+            for directory, entries in scanTree(root, skip):
+                parent = len(dirs)
+                dirs.append(directory)
+                names.extend(entries)
+                parents.extend([parent] * len(entries))
+        return cls(dirs, names, parents)
+
+    @classmethod
+    def load(cls, path):
+        # a line starting with "/" is a directory, the lines after it the names in it
+        dirs, names, parents = [], [], array.array("I")
+        with gzip.open(path, "rt", encoding="utf-8", errors="surrogateescape") as indexFile:
+            for line in indexFile:
+                line = line[:-1]
+                if line.startswith("/"):
+                    dirs.append(line)
+                else:
+                    names.append(line)
+                    parents.append(len(dirs) - 1)
+        return cls(dirs, names, parents)
+
+    def save(self, path):
+        byDir = [[] for _ in self.dirs]
+        for name, parent in zip(self.names, self.parents):
+            byDir[parent].append(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partial = path + ".partial"
+        with gzip.open(partial, "wt", encoding="utf-8", errors="surrogateescape", compresslevel=6) as indexFile:
+            for directory, names in zip(self.dirs, byDir):
+                indexFile.write(directory + "\n")
+                if names:
+                    indexFile.write("\n".join(names) + "\n")
+        os.replace(partial, path)
+
+    def __len__(self):
+        return len(self.names)
+
+    def path(self, index):
+        return os.path.join(self.dirs[self.parents[index]], self.names[index])
+
+    def exact(self, name):
+        name = name.lower()
+        index = bisect.bisect_left(self.lowered, name)
+        while index < len(self.lowered) and self.lowered[index] == name:
+            yield index
+            index += 1
+
+    def prefix(self, prefix):
+        prefix = prefix.lower()
+        index = bisect.bisect_left(self.lowered, prefix)
+        while index < len(self.lowered) and self.lowered[index].startswith(prefix):
+            yield index
+            index += 1
+
+    def fuzzy(self, query):
+        """Names holding every word of query, each word also in its known near spellings."""
+        words = re.findall(r"[a-z0-9]+", query.lower())
+        if not words:
+            return
+        patterns = []
+        for word in words:
+            spellings = {word} | {known for _, known in self.vocabulary.similar(word, FUZZY_THRESHOLD)}
+            patterns.append(re.compile("|".join(re.escape(spelling) for spelling in
+                                                sorted(spellings, key=len, reverse=True))))
+        # walk the hits of the rarest word and check the others per name
+        if len(patterns) > 1:
+            patterns.sort(key=lambda pattern: len(pattern.findall(self.keys)))
+        last = -1
+        for found in patterns[0].finditer(self.keys):
+            index = bisect.bisect_right(self.starts, found.start()) - 1
+            if index == last:
+                continue
+            last = index
+            key = self.keys[self.starts[index]:self.starts[index + 1] - 1]
+            if all(pattern.search(key) for pattern in patterns[1:]):
+                yield index
+
+
+class InotifyWatcher:
+    """Directory watches through inotify(7), called back with (mask, path).
+
+    At most `limit` directories are watched (see watchLimit), leaving the rest
+    of the user's watches to other applications.
+    """
+
+    def __init__(self, onEvent, limit=None):
+        self.onEvent = onEvent
+        self.limit = watchLimit() if limit is None else limit
+        self.libc = ctypes.CDLL("libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.full = False
+
+    def add(self, directory):
+        if self.full:
+            return False
+        if len(self.watches) >= self.limit:
+            print(f"Watching {self.limit} directories, the rescan covers the rest", file=sys.stderr)
+            self.full = True
+            return False
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            if ctypes.get_errno() == 28:
+                # ENOSPC: fs.inotify.max_user_watches reached, the rescan covers the rest
+                print(f"Watching {len(self.watches)} directories, no more inotify watches left",
+                      file=sys.stderr)
+                self.full = True
+            return False
+        self.watches[wd] = directory
+        return True
+
+    def run(self):
+        while True:
+            data = os.read(self.fd, 65536)
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = struct.unpack_from("iIII", data, offset)
+                name = data[offset + 16:offset + 16 + length].rstrip(b"\0")
+                offset += 16 + length
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                elif mask & IN_Q_OVERFLOW:
+                    self.onEvent(mask, None)
+                elif wd in self.watches:
+                    self.onEvent(mask, os.path.join(self.watches[wd], os.fsdecode(name)))
+
+
+class FileIndex:
+    """Filename index behind "search file", built and kept fresh in the background.
+
+    The index is loaded from `path` at start and rebuilt with os.scandir when
+    it is older than `rescanInterval` seconds. Between rebuilds, inotify
+    watches on the home directory record created and deleted files in a
+    small overlay that lookups consult next to the snapshot; a rebuild swaps
+    in a new snapshot with a single assignment and drops the overlay.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, roots=("/",), watchRoots=None, rescanInterval=3600.0):
+        self.path = path
+        self.roots = list(roots)
+        self.watchRoots = watchRoots or [os.path.expanduser("~")]
+        self.rescanInterval = rescanInterval
+        self.table = None
+        self.builtAt = 0.0
+        self.added = {}
+        self.removed = {}
+        self.lock = threading.Lock()
+        self.rescanRequested = threading.Event()
+        self.watcher = None
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._maintain, daemon=True, name="file-index")
+            self.thread.start()
+
+    def _maintain(self):
+        # the index is a background job: lowest CPU priority for this thread only
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        if self.path and os.path.exists(self.path):
+            start = time.perf_counter()
+            try:
+                self.table = FileTable.load(self.path)
+                self.builtAt = os.path.getmtime(self.path)
+                print(f"===> Loaded {len(self.table)} file names in {time.perf_counter() - start:.1f}s")
+            except (OSError, EOFError, ValueError) as e:
+                print(f"Could not load the file index {self.path}: {e}", file=sys.stderr)
+        self._watch()
+        while True:
+            if time.time() - self.builtAt >= self.rescanInterval:
+                self.rescan()
+            self.rescanRequested.wait(timeout=max(1.0, self.builtAt + self.rescanInterval - time.time()))
+            if self.rescanRequested.is_set():
+                self.rescanRequested.clear()
+                self.builtAt = 0.0
+
+    def _watch(self):
+        try:
+            self.watcher = InotifyWatcher(self._changed)
+        except OSError as e:
+            print(f"No inotify, the file index is only refreshed by rescans: {e}", file=sys.stderr)
+            return
+        for root in self.watchRoots:
+            self._watchTree(root)
+        threading.Thread(target=self.watcher.run, daemon=True, name="file-index-watch").start()
+
+    def _watchTree(self, root):
+        # breadth first, so the directories nearest the top get the watches; hidden and bulk trees
+        # (caches, dependencies, build output) change constantly and are left to the rescan
+        if os.path.basename(root).startswith(".") or os.path.basename(root) in UNWATCHED:
+            return
+        queue = collections.deque([root])
+        while queue and not self.watcher.full:
+            directory = queue.popleft()
+            # a directory that vanished or cannot be read is skipped; only the watch limit ends the walk
+            if not self.watcher.add(directory):
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    queue.extend(entry.path for entry in entries if not entry.name.startswith(".")
+                                 and entry.name not in UNWATCHED and entry.is_dir(follow_symlinks=False))
+            except OSError:
+                pass
+
+    def _changed(self, mask, path):
+        if path is None:
+            self.rescanRequested.set()
+            return
+        now = time.time()
+        created = [path]
+        if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+            # a directory moved in arrives with its contents
+            for directory, names in scanTree(path):
+                created += [os.path.join(directory, name) for name in names]
+            self._watchTree(path)
+        with self.lock:
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                self.removed.pop(path, None)
+                self.added.update(dict.fromkeys(created, now))
+            else:
+                self.added.pop(path, None)
+                self.removed[path] = now
+
+    def rescan(self):
+        start = time.time()
+        table = FileTable.scan(self.roots)
+        with self.lock:
+            self.table = table
+            self.builtAt = start
+            # changes seen while scanning may be missing from the snapshot, so they stay
+            self.added = {path: seen for path, seen in self.added.items() if seen >= start}
+            self.removed = {path: seen for path, seen in self.removed.items() if seen >= start}
+        print(f"===> Indexed {len(table)} file names in {time.time() - start:.1f}s")
+        if self.path:
+            try:
+                table.save(self.path)
+            except OSError as e:
+                print(f"Could not save the file index {self.path}: {e}", file=sys.stderr)
+
+    def _isRemoved(self, path, removed):
+        if path in removed:
+            return True
+        parent = os.path.dirname(path)
+        while parent != "/" and parent:
+            if parent in removed:
+                return True
+            parent = os.path.dirname(parent)
+        return False
+
+    def find(self, query, mode="exact", limit=20):
+        """Paths whose name matches `query` (exact, prefix or fuzzy), or None before the first build."""
+        table = self.table
+        if table is None:
+            return None
+        with self.lock:
+            added = list(self.added)
+            removed = set(self.removed)
+        paths = []
+        for index in getattr(table, mode)(query):
+            path = table.path(index)
+            if not removed or not self._isRemoved(path, removed):
+                paths.append(path)
+                if len(paths) == limit:
+                    return paths
+        if added:
+            # each created path is its own directory entry in a throwaway table
+            overlay = FileTable([os.path.dirname(path) for path in added],
+                                [os.path.basename(path) for path in added], range(len(added)))
+            paths += [overlay.path(index) for index in getattr(overlay, mode)(query)]
+        return paths[:limit]
+
+    def search(self, query, limit=20):
+        """Exact matches first, then prefix and fuzzy ones, for a name as dictated."""
+        query = spokenName(query)
+        paths = []
+        for mode in ("exact", "prefix", "fuzzy"):
+            found = self.find(query, mode, limit)
+            if found is None:
+                return None
+            paths += [path for path in found if path not in paths]
+            if len(paths) >= limit:
+                break
+        return paths[:limit]
+
+
+FILE_INDEX = FileIndex()
@@ -0,0 +1,96 @@
+from collections import Counter
+
+# postings read per window; common trigrams past this budget are not scanned
+POSTINGS_BUDGET = 256
+
+
+def trigrams(key):
+    padded = f"^{key}$"
+    return [padded[index:index + 3] for index in range(len(padded) - 2)]
+
+
+def boundedDistance(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it is known to exceed limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for row, charA in enumerate(a, 1):
+        current = [row]
+        for column, charB in enumerate(b, 1):
+            current.append(min(previous[column] + 1, current[column - 1] + 1,
+                               previous[column - 1] + (charA != charB)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class PhraseIndex:
+    """Character trigram index over trigger phrases for approximate matching.
+
+    Phrases and transcript windows are compared with their spaces removed,
+    so "rhythm box" and "rhythmbox" are the same key. A window's trigrams
+    look up candidate phrases in the index, rarest first and no more than
+    POSTINGS_BUDGET postings per window, so the cost does not grow with the
+    table; only candidates that can share enough trigrams to be within the
+    edit distance allowed by the threshold are verified with a bounded
+    Levenshtein distance. The score is 1 - distance / length of the longer key.
+    """
+
+    def __init__(self, entries, candidates=8):
+        # entries: (phrase, payload) pairs
+        self.entries = []
+        self.postings = {}
+        self.maxWords = 0
+        self.candidates = candidates
+        for phrase, payload in entries:
+            words = phrase.lower().split()
+            key = "".join(words)
+            grams = set(trigrams(key))
+            number = len(self.entries)
+            self.entries.append((key, len(grams), len(words), phrase, payload))
+            self.maxWords = max(self.maxWords, len(words))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(number)
+
+    def best(self, words, threshold):
+        """(score, start, end, phrase, payload) of the closest phrase in the words, or None."""
+        best = None
+        # one more word than the longest phrase, for a word the recognizer split in two
+        for start in range(len(words)):
+            for end in range(start + 1, min(start + self.maxWords + 1, len(words)) + 1):
+                window = "".join(words[start:end])
+                for score, number in self._closest(window, threshold):
+                    _, _, length, phrase, payload = self.entries[number]
+                    if best is None or (score, length) > (best[0], best[5]):
+                        best = (score, start, end, phrase, payload, length)
+        return best[:5] if best else None
+
+    def similar(self, text, threshold):
+        """(score, payload) of every phrase scoring at least threshold against text, best first."""
+        key = "".join(text.lower().split())
+        found = [(score, self.entries[number][4]) for score, number in self._closest(key, threshold)]
+        return sorted(found, key=lambda item: -item[0])
+
+    def _closest(self, window, threshold):
+        grams = set(trigrams(window))
+        postings = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        shared = Counter()
+        scanned = 0
+        unscanned = len(postings)
+        for numbers in postings:
+            if scanned and scanned + len(numbers) > POSTINGS_BUDGET:
+                break
+            shared.update(numbers)
+            scanned += len(numbers)
+            unscanned -= 1
+        for number, count in shared.most_common(self.candidates):
+            key, keyGrams = self.entries[number][:2]
+            longest = max(len(key), len(window))
+            limit = int((1 - threshold) * longest)
+            # each edit changes at most three trigrams; an unscanned gram may be shared
+            if count + unscanned < max(len(grams), keyGrams) - 3 * limit:
+                continue
+            distance = boundedDistance(window, key, limit)
+            if distance <= limit:
+                yield 1 - distance / longest, number
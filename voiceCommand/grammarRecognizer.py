@@ -0,0 +1,107 @@
+import collections
+import json
+
+
+class GrammarRecognizer:
+    """Decodes against the command phrases only, with full vocabulary on demand.
+
+    The grammar recognizer only knows the trigger phrases (plus "[unk]"), which
+    is much cheaper than large-vocabulary decoding. As soon as a partial result
+    names a command that takes a free-form argument ("search google ...", the
+    audio of the utterance so far is replayed into a full-vocabulary recognizer,
+    which finishes the utterance. Both recognizers come from makeRecognizer so
+    this works the same for a local model and for the recognizer daemon. A
+    matcher passed to setMatcher() gets a new grammar recognizer on the same
+    model before the next utterance starts.
+    """
+
+    def __init__(self, makeRecognizer, matcher, maxUtteranceBlocks=500):
+        self.makeRecognizer = makeRecognizer
+        self.matcher = matcher
+        self.nextMatcher = None
+        self.words = None
+        self.grammarRecognizer = makeRecognizer(self._grammar(matcher))
+        self.fullRecognizer = makeRecognizer(None)
+        self.utterance = collections.deque(maxlen=maxUtteranceBlocks)
+        self.fullVocabulary = False
+        self.result = "{}"
+        self.switches = 0
+
+    def _grammar(self, matcher):
+        return json.dumps(sorted(set(phrase.lower() for phrase in matcher.phrases())) + ["[unk]"])
+
+    def SetWords(self, words):
+        self.words = words
+        self.grammarRecognizer.SetWords(words)
+        self.fullRecognizer.SetWords(words)
+
+    def setMatcher(self, matcher):
+        # called from the reload thread; the decoding thread switches between utterances
+        self.nextMatcher = matcher
+
+    def _useNextMatcher(self):
+        matcher, self.nextMatcher = self.nextMatcher, None
+        recognizer = self.makeRecognizer(self._grammar(matcher))
+        if self.words is not None:
+            recognizer.SetWords(self.words)
+        self.grammarRecognizer = recognizer
+        self.matcher = matcher
+
+    def _needsArgument(self, text):
+        match = self.matcher.match(text) if text else None
+        return match is not None and match.command.pattern is not None
+
+    def _endUtterance(self, result):
+        self.result = result
+        self.utterance.clear()
+        self.fullVocabulary = False
+        return True
+
+    def _switchToFullVocabulary(self):
+        self.fullVocabulary = True
+        self.switches += 1
+        self.grammarRecognizer.Reset()
+        for block in self.utterance:
+            if self.fullRecognizer.AcceptWaveform(block):
+                return self._endUtterance(self.fullRecognizer.Result())
+        return False
+
+    def AcceptWaveform(self, data):
+        if self.nextMatcher is not None and not self.utterance:
+            self._useNextMatcher()
+        self.utterance.append(data)
+        if self.fullVocabulary:
+            if self.fullRecognizer.AcceptWaveform(data):
+                return self._endUtterance(self.fullRecognizer.Result())
+            return False
+
+        if self.grammarRecognizer.AcceptWaveform(data):
+            result = self.grammarRecognizer.Result()
+            if not self._needsArgument(json.loads(result).get("text")):
+                return self._endUtterance(result)
+            # The utterance ended before the partials showed the prefix
+            if self._switchToFullVocabulary():
+                return True
+            return self._endUtterance(self.fullRecognizer.FinalResult())
+
+        if self._needsArgument(json.loads(self.grammarRecognizer.PartialResult()).get("partial")):
+            return self._switchToFullVocabulary()
+        return False
+
+    def Result(self):
+        return self.result
+
+    def PartialResult(self):
+        active = self.fullRecognizer if self.fullVocabulary else self.grammarRecognizer
+        return active.PartialResult()
+
+    def FinalResult(self):
+        active = self.fullRecognizer if self.fullVocabulary else self.grammarRecognizer
+        self._endUtterance(active.FinalResult())
+        return self.result
+
+    def Reset(self):
+        self.grammarRecognizer.Reset()
+        self.fullRecognizer.Reset()
+        self.utterance.clear()
+        self.fullVocabulary = False
@@ -0,0 +1,189 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+# Pipeline stages in the order they happen to an utterance
+STAGES = ("captured", "dequeued", "final", "parsed", "matched", "spawned", "exited")
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    def quantile(self, q):
+        # Linear interpolation inside the bucket holding the q-th observation
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for upper, count in zip(BUCKETS, self.counts):
+            if count and seen + count >= rank:
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+            lower = upper
+        return lower
+
+
+class Trace:
+    """Timestamps of one utterance on its way from the microphone to a process."""
+
+    def __init__(self, tracer, text, stamps):
+        self.tracer = tracer
+        self.text = text
+        self.stamps = stamps
+
+    def mark(self, stage):
+        self.stamps[stage] = time.monotonic()
+
+    def finish(self, command):
+        self.tracer.complete(self, command or "unrecognized")
+
+
+class LatencyTracer:
+    """Collects per-stage timestamps and publishes latency statistics.
+
+    The record thread only stores a couple of floats per audio block; the
+    histograms are updated once per utterance. With a trace directory, every
+    utterance is appended to a JSONL trace together with periodic queue depth
+    samples, and the aggregates are rewritten as a Prometheus text file for
+    local scraping. Without one, only the in-memory histograms are kept.
+    """
+
+    def __init__(self, traceDir=None, sampleInterval=1.0):
+        self.traceFile = None
+        if traceDir:
+            os.makedirs(traceDir, exist_ok=True)
+            self.tracePath = os.path.join(traceDir, "voice-trace.jsonl")
+            self.metricsPath = os.path.join(traceDir, "voice-metrics.prom")
+            self.traceFile = open(self.tracePath, "a", buffering=1)
+        self.sampleInterval = sampleInterval
+        self.lock = threading.Lock()
+
+        self.captured = 0.0
+        self.dequeued = 0.0
+        self.pending = {}
+        self.nextSample = 0.0
+        self.queueDepth = 0
+        self.lagSeconds = 0.0
+
+        self.endToEnd = {}
+        self.stageHistograms = {stage: Histogram() for stage in STAGES[1:]}
+
+    def block(self, captured, dequeued):
+        self.captured = captured
+        self.dequeued = dequeued
+
+    def stage(self, name):
+        self.pending[name] = time.monotonic()
+
+    def utterance(self, text):
+        stamps = {"captured": self.captured, "dequeued": self.dequeued}
+        stamps.update(self.pending)
+        self.pending = {}
+        return Trace(self, text, stamps)
+
+    def sampleQueue(self, depth, lagMs):
+        now = time.monotonic()
+        if self.traceFile is None or now < self.nextSample:
+            return
+        self.nextSample = now + self.sampleInterval
+        self.queueDepth = depth
+        self.lagSeconds = lagMs / 1000
+        with self.lock:
+            self.traceFile.write(json.dumps({"type": "queue", "time": time.time(), "depth": depth,
+                                             "lagMs": round(lagMs, 1)}) + "\n")
+            self._writeMetrics()
+
+    def complete(self, trace, command):
+        stamps = trace.stamps
+        last = max(stamps.get("spawned", 0), stamps.get("matched", 0))
+        with self.lock:
+            histogram = self.endToEnd.setdefault(command, Histogram())
+            if stamps.get("captured") and last:
+                histogram.observe(last - stamps["captured"])
+            previous = stamps.get("captured")
+            for stage in STAGES[1:]:
+                if stage in stamps and previous:
+                    self.stageHistograms[stage].observe(stamps[stage] - previous)
+                    previous = stamps[stage]
+            if self.traceFile is None:
+                return
+            record = {"type": "utterance", "time": time.time(), "text": trace.text, "command": command}
+            base = stamps.get("captured") or min(stamps.values())
+            record.update({f"{stage}Ms": round((stamps[stage] - base) * 1000, 2)
+                           for stage in STAGES if stage in stamps})
+            self.traceFile.write(json.dumps(record) + "\n")
+            self._writeMetrics()
+
+    def _writeMetrics(self):
+        lines = [
+            "# HELP voice_command_latency_seconds Time from the last audio block of an utterance to its action.",
+            "# TYPE voice_command_latency_seconds histogram",
+        ]
+        for command, histogram in sorted(self.endToEnd.items()):
+            lines += self._histogramLines("voice_command_latency_seconds", f'command="{command}"', histogram)
+        lines += [
+            "# HELP voice_command_latency_quantile_seconds Estimated latency percentiles per command.",
+            "# TYPE voice_command_latency_quantile_seconds gauge",
+        ]
+        for command, histogram in sorted(self.endToEnd.items()):
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f'voice_command_latency_quantile_seconds{{command="{command}",quantile="{q}"}} '
+                             f"{histogram.quantile(q):.6f}")
+        lines += [
+            "# HELP voice_stage_latency_seconds Time spent reaching each pipeline stage from the previous one.",
+            "# TYPE voice_stage_latency_seconds histogram",
+        ]
+        for stage, histogram in self.stageHistograms.items():
+            lines += self._histogramLines("voice_stage_latency_seconds", f'stage="{stage}"', histogram)
+        lines += [
+            "# HELP voice_audio_queue_depth Audio blocks waiting to be decoded.",
+            "# TYPE voice_audio_queue_depth gauge",
+            f"voice_audio_queue_depth {self.queueDepth}",
+            "# HELP voice_audio_lag_seconds Age of the audio block being decoded.",
+            "# TYPE voice_audio_lag_seconds gauge",
+            f"voice_audio_lag_seconds {self.lagSeconds:.6f}",
+        ]
+        temporary = self.metricsPath + ".tmp"
+        with open(temporary, "w") as metrics:
+            metrics.write("\n".join(lines) + "\n")
+        os.replace(temporary, self.metricsPath)
+
+    def _histogramLines(self, name, labels, histogram):
+        lines = []
+        cumulative = 0
+        for upper, count in zip(BUCKETS, histogram.counts):
+            cumulative += count
+            le = "+Inf" if upper == float("inf") else f"{upper:g}"
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return lines
+
+    def summary(self):
+        lines = ["Command latency (p50 / p95 / p99 ms):"]
+        for command, histogram in sorted(self.endToEnd.items()):
+            p50, p95, p99 = (histogram.quantile(q) * 1000 for q in (0.5, 0.95, 0.99))
+            lines.append(f"  {command}: {p50:.0f} / {p95:.0f} / {p99:.0f} ({histogram.count}x)")
+        return "\n".join(lines)
+
+    def close(self):
+        with self.lock:
+            if self.traceFile:
+                self.traceFile.close()
+                self.traceFile = None
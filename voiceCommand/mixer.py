@@ -0,0 +1,178 @@
+import re
+import subprocess
+import sys
+import threading
+import time
+
+MIXERS = ("auto", "pulse", "amixer", "fake")
+
+
+class PulseBackend:
+    """Default PulseAudio sink over one native connection (needs pulsectl)."""
+
+    def __init__(self):
+        import pulsectl
+
+        self.errors = (pulsectl.PulseError, OSError)
+        self.pulse = pulsectl.Pulse("voiceCommand")
+
+    def _sink(self):
+        return self.pulse.get_sink_by_name(self.pulse.server_info().default_sink_name)
+
+    def get(self):
+        return round(self.pulse.volume_get_all_chans(self._sink()) * 100)
+
+    def set(self, level):
+        self.pulse.volume_set_all_chans(self._sink(), level / 100)
+
+    def close(self):
+        self.pulse.close()
+
+
+class AmixerBackend:
+    """One `amixer -s` process kept running, fed a line per volume change.
+
+    get() forks `amixer sget`; VolumeControl only calls it for the first
+    command and after an idle period, so changes made elsewhere (volume keys,
+    the panel slider) are picked up at most one fork per idle period.
+    """
+
+    errors = (OSError, subprocess.SubprocessError)
+
+    def __init__(self, device="pulse", control="Master"):
+        self.argv = ["amixer", "-D", device]
+        self.control = control
+        self.process = None
+
+    def get(self):
+        output = subprocess.run(self.argv + ["sget", self.control], stdout=subprocess.PIPE, text=True,
+                                check=True).stdout
+        levels = re.findall(r"\[(\d+)%\]", output)
+        return int(levels[0]) if levels else 0
+
+    def set(self, level):
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(self.argv + ["-q", "-s"], stdin=subprocess.PIPE,
+                                            stdout=subprocess.DEVNULL, text=True)
+        self.process.stdin.write(f"sset {self.control} {level}%\n")
+        self.process.stdin.flush()
+
+    def close(self):
+        if self.process is not None:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+            self.process = None
+
+
+class FakeMixer:
+    """Records every write instead of touching the sound system."""
+
+    errors = ()
+
+    def __init__(self, level=50):
+        self.level = level
+        self.writes = []
+
+    def get(self):
+        return self.level
+
+    def set(self, level):
+        self.level = level
+        self.writes.append(level)
+
+    def close(self):
+        pass
+
+
+def openMixer(name="auto"):
+    if name == "fake":
+        return FakeMixer()
+    if name == "amixer":
+        return AmixerBackend()
+    try:
+        return PulseBackend()
+    except Exception as e:
+        if name == "pulse":
+            raise
+        print(f"No native PulseAudio connection ({e}), using amixer", file=sys.stderr)
+        return AmixerBackend()
+
+
+class VolumeControl:
+    """Volume commands applied through one long-lived mixer connection.
+
+    Changes are made to a target level and written after `window` seconds as
+    a single absolute set, so "volume up" said three times in a row is one
+    write of +30%. The level is read back from the mixer only when the
+    control has been idle for `resync` seconds, to pick up changes made
+    elsewhere. `backend` is a name from MIXERS or a mixer object with get(),
+    set(), close() and `errors`, the exceptions its calls may raise; a mixer
+    that fails is reopened on the next command.
+    """
+
+    def __init__(self, backend="auto", window=0.15, resync=30.0):
+        self.backend = backend
+        self.mixer = None
+        self.window = window
+        self.resync = resync
+        self.lock = threading.Lock()
+        self.level = None
+        self.lastChange = 0.0
+        self.timer = None
+        self.requests = 0
+        self.writes = 0
+
+    def useBackend(self, backend):
+        with self.lock:
+            if self.mixer is not None:
+                self.mixer.close()
+            self.backend = backend
+            self.mixer = None
+            self.level = None
+
+    def adjust(self, delta):
+        self._request(lambda level: level + delta)
+
+    def setLevel(self, level):
+        self._request(lambda _: level)
+
+    def _request(self, change):
+        with self.lock:
+            if self.mixer is None:
+                self.mixer = openMixer(self.backend) if isinstance(self.backend, str) else self.backend
+            now = time.monotonic()
+            if self.level is None or (self.timer is None and now - self.lastChange > self.resync):
+                self.level = self.mixer.get()
+            self.level = max(0, min(100, change(self.level)))
+            self.lastChange = now
+            self.requests += 1
+            if self.timer is None:
+                self.timer = threading.Timer(self.window, self._flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def _flush(self):
+        with self.lock:
+            self.timer = None
+            self.writes += 1
+            try:
+                self.mixer.set(self.level)
+            except self.mixer.errors as e:
+                print(f"Could not set the volume: {e}", file=sys.stderr)
+                self._drop()
+
+    def _drop(self):
+        # a lost connection is opened again by the next command
+        try:
+            self.mixer.close()
+        except self.mixer.errors:
+            pass
+        if isinstance(self.backend, str):
+            self.mixer = None
+        self.level = None
+
+    def summary(self):
+        return f"Volume: {self.requests} commands in {self.writes} mixer writes"
+
+
+VOLUME = VolumeControl()
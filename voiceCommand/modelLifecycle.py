@@ -0,0 +1,132 @@
+import ctypes
+import gc
+import os
+import threading
+
+GIB = 1024 ** 3
+MODEL_DIR = "/usr/share/vosk/models"
+
+# Largest first, with roughly the resident memory each model needs once loaded
+MODEL_VARIANTS = [
+    (os.path.join(MODEL_DIR, "vosk-model-en-us-0.42"), 6.0 * GIB),
+    (os.path.join(MODEL_DIR, "vosk-model-en-us-0.22"), 3.5 * GIB),
+    (os.path.join(MODEL_DIR, "vosk-model-small-en-us-0.15"), 0.3 * GIB),
+]
+
+
+def readMeminfo(path, key):
+    # /proc values are in kB
+    with open(path) as meminfo:
+        for line in meminfo:
+            if line.startswith(key + ":"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def memAvailable():
+    return readMeminfo("/proc/meminfo", "MemAvailable")
+
+
+def residentSetSize():
+    return readMeminfo("/proc/self/status", "VmRSS")
+
+
+def formatBytes(size):
+    if size >= GIB:
+        return f"{size / GIB:.1f} GB"
+    return f"{size / 1024 ** 2:.0f} MB"
+
+
+def releaseFreeMemory():
+    """Hand memory freed by the model back to the OS instead of keeping it in the heap."""
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def parseVariant(text):
+    """`path:GiB` as given to --model-variant."""
+    path, _, size = text.rpartition(":")
+    return path, float(size) * GIB
+
+
+def chooseModel(preferred, variants=None):
+    """Pick the largest installed model, no larger than `preferred`, that fits in MemAvailable.
+
+    A `preferred` path that is not one of the variants is used as given, and
+    so is `preferred` when no installed variant fits.
+    """
+    variants = variants or MODEL_VARIANTS
+    paths = [path for path, _ in variants]
+    if preferred not in paths:
+        return preferred
+    available = memAvailable()
+    for path, needed in variants[paths.index(preferred):]:
+        if needed <= available and os.path.isdir(path):
+            print(f"===> {formatBytes(available)} available, using {os.path.basename(path)} "
+                  f"(needs about {formatBytes(needed)})")
+            return path
+    print(f"===> {formatBytes(available)} available, no installed model fits, using {os.path.basename(preferred)}")
+    return preferred
+
+
+class ModelLifecycle:
+    """Keeps the model resident only while it is likely to be used.
+
+    When recording has been off for `idleSeconds`, the loader drops the model
+    and the freed memory is returned to the OS. The next time recording
+    starts, the model is loaded again in the background while the audio
+    waits in the loader's buffer.
+    """
+
+    def __init__(self, loader, idleSeconds=600):
+        self.loader = loader
+        self.idleSeconds = idleSeconds
+        self.timer = None
+        self.recording = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        self.loader.start()
+        self.recordingStopped()
+
+    def recordingStarted(self):
+        with self.lock:
+            self.recording = True
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            if self.loader.state == "unloaded":
+                print("===> Reloading the model in the background...")
+                self.loader.start()
+
+    def recordingStopped(self):
+        with self.lock:
+            self.recording = False
+            if not self.idleSeconds:
+                return
+            if self.timer:
+                self.timer.cancel()
+            timer = threading.Timer(self.idleSeconds, lambda: self._unloadIdle(timer))
+            timer.daemon = True
+            self.timer = timer
+            timer.start()
+
+    def _unloadIdle(self, timer):
+        with self.lock:
+            # cancel() cannot stop a timer already waiting for the lock
+            if timer is not self.timer or self.recording:
+                return
+            self.timer = None
+            if self.loader.state != "ready":
+                return
+            before = residentSetSize()
+            self.loader.unload()
+            releaseFreeMemory()
+        print(f"===> Model unloaded after {self.idleSeconds / 60:g} idle minutes, "
+              f"RSS {formatBytes(before)} -> {formatBytes(residentSetSize())}")
+
+    def summary(self):
+        return f"RSS {formatBytes(residentSetSize())} (model {self.loader.state})"
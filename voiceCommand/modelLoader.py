@@ -0,0 +1,226 @@
+import collections
+import json
+import os
+import sys
+import threading
+import time
+
+from voiceCommand.cascadeRecognizer import CascadeRecognizer
+from voiceCommand.grammarRecognizer import GrammarRecognizer
+from voiceCommand.modelLifecycle import formatBytes, residentSetSize
+from voiceCommand.wakeWord import WakeWordRecognizer
+from voiceCommand.recognizerDaemon import RemoteRecognizer, defaultSocketPath
+
+
+class ModelLoader:
+    """Builds the Vosk model and recognizer on a background thread.
+
+    Audio fed in while the model is still loading is held in a bounded
+    buffer (oldest blocks are dropped first) and decoded once it is ready.
+    When the recognizer daemon is running, the loader attaches to it instead
+    of loading a model of its own. With `grammar` set, decoding is restricted
+    to the matcher's trigger phrases. With a `smallModelPath`, utterances are
+    decoded by that model first and only re-decoded by the model at
+    `modelPath` when the small one is unsure (see CascadeRecognizer). With a
+    `wakePhrase`, only a keyword spotter runs until the phrase is heard.
+    """
+
+    def __init__(self, modelPath, samplerate, bufferSeconds=10, onStateChange=None,
+                 socketPath=None, matcher=None, tracer=None, grammar=False,
+                 smallModelPath=None, cascadeThreshold=0.75, wakePhrase=None, wakeWindow=5.0):
+        self.modelPath = modelPath
+        self.samplerate = samplerate
+        self.socketPath = defaultSocketPath() if socketPath is None else socketPath
+        self.matcher = matcher
+        self.grammar = grammar
+        self.smallModelPath = smallModelPath
+        self.cascadeThreshold = cascadeThreshold
+        self.wakePhrase = wakePhrase
+        self.wakeWindow = wakeWindow
+        self.tracer = tracer
+        self.onStateChange = onStateChange
+        self.state = "idle"
+        self.model = None
+        self.recognizer = None
+        self.ready = threading.Event()
+
+        # int16 mono, so two bytes per frame
+        self.maxPendingBytes = int(bufferSeconds * samplerate) * 2
+        self.pending = collections.deque()
+        self.pendingBytes = 0
+        self.droppedBlocks = 0
+
+        self.startTime = time.monotonic()
+        self.firstRecognition = None
+
+    def start(self):
+        self._setState("loading")
+        threading.Thread(target=self._load, daemon=True).start()
+
+    def _setState(self, state):
+        self.state = state
+        if self.onStateChange:
+            self.onStateChange(state)
+
+    def _load(self):
+        loadStart = time.monotonic()
+        # the daemon serves a single model, so the cascade always loads locally
+        if self.socketPath and os.path.exists(self.socketPath) and not self.smallModelPath:
+            try:
+                self.recognizer = self._buildRecognizer(
+                    lambda grammar: RemoteRecognizer(self.socketPath, self.samplerate, grammar=grammar))
+                print(f"===> Attached to the recognizer daemon in {time.monotonic() - loadStart:.3f}s")
+                self.ready.set()
+                self._setState("ready")
+                return
+            except OSError as e:
+                print(f"Recognizer daemon not reachable, loading the model locally: {e}", file=sys.stderr)
+
+        import vosk
+
+        print("===> Build the model and recognizer objects in the background...")
+        modelPath = self.smallModelPath or self.modelPath
+        try:
+            model = vosk.Model(modelPath)
+            cascade = None
+            if self.smallModelPath:
+                cascade = lambda recognizer: CascadeRecognizer(
+                    recognizer, lambda: vosk.KaldiRecognizer(vosk.Model(self.modelPath), self.samplerate),
+                    self.matcher, self.cascadeThreshold)
+            recognizer = self._buildRecognizer(lambda grammar: (
+                vosk.KaldiRecognizer(model, self.samplerate, grammar) if grammar
+                else vosk.KaldiRecognizer(model, self.samplerate)), cascade)
+            recognizer.SetWords(False)
+        except Exception as e:
+            print(f"Could not load the model {modelPath}: {e}", file=sys.stderr)
+            self._setState("failed")
+            return
+
+        self.model = model
+        self.recognizer = recognizer
+        print(f"===> Model ready in {time.monotonic() - loadStart:.1f}s, RSS {formatBytes(residentSetSize())}")
+        self.ready.set()
+        self._setState("ready")
+
+    def _buildRecognizer(self, makeRecognizer, cascade=None):
+        if not self.grammar:
+            recognizer = makeRecognizer(None)
+        else:
+            recognizer = GrammarRecognizer(makeRecognizer, self.matcher)
+        if cascade:
+            recognizer = cascade(recognizer)
+        # the wake-word gate goes outside the cascade, so escalation only replays audio from the wake phrase on
+        if self.wakePhrase:
+            spotter = makeRecognizer(json.dumps([self.wakePhrase.lower(), "[unk]"]))
+            recognizer = WakeWordRecognizer(spotter, recognizer, self.wakePhrase, self.samplerate, self.wakeWindow)
+        return recognizer
+
+    def unload(self):
+        """Drop the recognizer and model; start() loads them again."""
+        self.ready.clear()
+        recognizer, self.recognizer, self.model = self.recognizer, None, None
+        if hasattr(recognizer, "close"):
+            recognizer.close()
+        del recognizer
+        self.pending.clear()
+        self.pendingBytes = 0
+        self._setState("unloaded")
+
+    def setMatcher(self, matcher):
+        """Use a reloaded command table for the grammar and the cascade, now and after a reload."""
+        self.matcher = matcher
+        recognizer = self.recognizer
+        if hasattr(recognizer, "setMatcher"):
+            recognizer.setMatcher(matcher)
+
+    def reset(self):
+        """Drop buffered audio and the utterance in progress, keeping the model."""
+        self.pending.clear()
+        self.pendingBytes = 0
+        recognizer = self.recognizer
+        if self.ready.is_set() and recognizer is not None:
+            try:
+                recognizer.Reset()
+            except OSError as e:
+                self._lostDaemon(e)
+
+    def markInteractive(self):
+        print(f"===> Time to first interaction: {time.monotonic() - self.startTime:.3f}s")
+
+    def feed(self, data):
+        """Feed one audio block and return the texts of any finished utterances."""
+        self.pending.append(data)
+        self.pendingBytes += len(data)
+        if not self.ready.is_set():
+            while self.pendingBytes > self.maxPendingBytes:
+                self.pendingBytes -= len(self.pending.popleft())
+                self.droppedBlocks += 1
+            return []
+
+        if self.droppedBlocks:
+            print(f"Dropped {self.droppedBlocks} audio blocks captured while loading", file=sys.stderr)
+            self.droppedBlocks = 0
+        texts = []
+        # read once: an idle unload may set self.recognizer to None between two blocks
+        recognizer = self.recognizer
+        while self.pending and self.ready.is_set() and recognizer is not None:
+            block = self.pending.popleft()
+            self.pendingBytes -= len(block)
+            texts.extend(self._accept(recognizer, block))
+        return texts
+
+    def flush(self):
+        """Finish the utterance in progress, e.g. when the VAD saw speech end."""
+        recognizer = self.recognizer
+        if not self.ready.is_set() or self.pending or recognizer is None:
+            return []
+        try:
+            result = recognizer.FinalResult()
+            self._stage("final")
+            return self._texts(result)
+        except OSError as e:
+            self._lostDaemon(e)
+            return []
+
+    def partial(self):
+        """Text of the utterance in progress, as far as it has been decoded."""
+        recognizer = self.recognizer
+        if not self.ready.is_set() or self.pending or recognizer is None:
+            return ""
+        try:
+            return json.loads(recognizer.PartialResult()).get("partial", "")
+        except OSError as e:
+            self._lostDaemon(e)
+            return ""
+
+    def _accept(self, recognizer, data):
+        try:
+            if not recognizer.AcceptWaveform(data):
+                return []
+            self._stage("final")
+            return self._texts(recognizer.Result())
+        except OSError as e:
+            self._lostDaemon(e)
+            return []
+
+    def _lostDaemon(self, error):
+        # The daemon went away; reload locally and keep buffering in the meantime
+        print(f"Lost the recognizer daemon: {error}", file=sys.stderr)
+        self.ready.clear()
+        self.recognizer = None
+        self.socketPath = ""
+        self.start()
+
+    def _stage(self, name):
+        if self.tracer:
+            self.tracer.stage(name)
+
+    def _texts(self, result):
+        text = json.loads(result).get("text")
+        self._stage("parsed")
+        if not text:
+            return []
+        if self.firstRecognition is None:
+            self.firstRecognition = time.monotonic() - self.startTime
+            print(f"===> Time to first recognition: {self.firstRecognition:.3f}s")
+        return [text]
@@ -0,0 +1,76 @@
+import argparse
+
+from voiceCommand.audioRingBuffer import DROP_OLDEST, POLICIES
+from voiceCommand.commandMatcher import PRIORITIES
+from voiceCommand.fileIndex import DEFAULT_PATH
+from voiceCommand.mixer import MIXERS
+from voiceCommand.modelLifecycle import parseVariant
+from voiceCommand.resampler import CAPTURE_MODES, RESAMPLE
+
+
+def addPipelineArguments(parser):
+    """Switches for the recognition pipeline, shared by the front-ends and the tools."""
+    parser.add_argument("--commands", metavar="JSON",
+                        help="load the command table from this file and reload it whenever it changes "
+                             "(python3 -m voiceCommand.commandRegistry prints the built-in table)")
+    parser.add_argument("--concurrency", type=parseLimit, action="append", metavar="CLASS=N",
+                        help="how many commands of a priority class (urgent, normal, slow) may run at once "
+                             "(default: urgent=4 normal=2 slow=1)")
+    parser.add_argument("--grammar", action="store_true",
+                        help="decode against the command phrases only, switching to full "
+                             "vocabulary for commands that take an argument")
+    parser.add_argument("--cascade", metavar="SMALL_MODEL",
+                        help="decode with this small model first and re-decode with the front-end's large "
+                             "model only when no command matches or a word is below --cascade-threshold")
+    parser.add_argument("--cascade-threshold", type=float, default=0.75,
+                        help="lowest word confidence the small model may report (default: %(default)s)")
+    parser.add_argument("--wake-word", metavar="PHRASE",
+                        help="only spot this phrase until it is heard, then decode one command with the "
+                             "full recognizer")
+    parser.add_argument("--wake-window", type=float, default=5.0, metavar="SECONDS",
+                        help="how long the full recognizer listens after the wake phrase (default: %(default)s)")
+    parser.add_argument("--no-vad", action="store_true",
+                        help="decode every audio block instead of skipping silence")
+    parser.add_argument("--vad-threshold", type=float, default=300.0,
+                        help="minimum RMS level of a speech block (default: %(default)s)")
+    parser.add_argument("--overrun-policy", choices=POLICIES, default=DROP_OLDEST,
+                        help="what to drop when decoding falls behind the microphone (default: %(default)s)")
+    parser.add_argument("--fuzzy-threshold", type=float, default=0.8,
+                        help="lowest score (0-1) at which a transcript that only resembles a command phrase "
+                             "still runs it, 0 for exact phrases only (default: %(default)s)")
+    parser.add_argument("--early-dispatch", action="store_true",
+                        help="run short commands as soon as a partial result matches them")
+    parser.add_argument("--early-blocks", type=int, default=3,
+                        help="consecutive matching partial results needed to fire early (default: %(default)s)")
+    parser.add_argument("--input-device", type=lambda text: int(text) if text.isdigit() else text,
+                        help="microphone to listen on, by number or name as listed at startup "
+                             "(default: the system default input)")
+    parser.add_argument("--capture", choices=CAPTURE_MODES, default=RESAMPLE,
+                        help="how capture audio reaches the model's 16 kHz: resample the device's native "
+                             "rate, ask PortAudio for 16 kHz, or decode at the native rate (default: %(default)s)")
+    parser.add_argument("--idle-unload", type=float, default=10.0, metavar="MINUTES",
+                        help="release the model after this long with recording off, 0 to keep it "
+                             "(default: %(default)s)")
+    parser.add_argument("--model-variant", action="append", type=parseVariant, metavar="PATH:GIB",
+                        help="model to consider at startup and the memory it needs, largest first; the "
+                             "first that fits in MemAvailable is used (default: the installed en-us models)")
+    parser.add_argument("--mixer", choices=MIXERS, default="auto",
+                        help="how volume commands reach the sound system: a native PulseAudio connection, "
+                             "one long-running amixer, or a fake mixer that only counts writes "
+                             "(default: %(default)s, PulseAudio if pulsectl is installed)")
+    parser.add_argument("--volume-window", type=float, default=0.15, metavar="SECONDS",
+                        help="volume commands within this window are merged into one write (default: %(default)s)")
+    parser.add_argument("--file-index", default=DEFAULT_PATH, metavar="PATH",
+                        help="where \"search file\" keeps its filename index (default: %(default)s)")
+    parser.add_argument("--rescan-interval", type=float, default=60.0, metavar="MINUTES",
+                        help="rebuild the filename index this often; the home directory is also watched "
+                             "with inotify (default: %(default)s)")
+    parser.add_argument("--trace-dir",
+                        help="write a JSONL latency trace and a Prometheus metrics file into this directory")
+
+
+def parseLimit(text):
+    priority, _, limit = text.partition("=")
+    if priority not in PRIORITIES or not limit.isdigit() or int(limit) < 1:
+        raise argparse.ArgumentTypeError(f"expected CLASS=N with CLASS one of {', '.join(PRIORITIES)}")
+    return priority, int(limit)
@@ -0,0 +1,174 @@
+import time
+
+from voiceCommand.audioRingBuffer import AudioRingBuffer
+from voiceCommand.commandExecutor import CommandExecutor
+from voiceCommand.commandRegistry import CommandRegistry
+from voiceCommand.earlyDispatch import EarlyDispatcher
+from voiceCommand.fileIndex import FILE_INDEX
+from voiceCommand.latencyTrace import LatencyTracer
+from voiceCommand.mixer import VOLUME
+from voiceCommand.modelLifecycle import ModelLifecycle
+from voiceCommand.modelLoader import ModelLoader
+from voiceCommand.resampler import MODEL_RATE, NATIVE, Resampler
+from voiceCommand.voiceActivity import VoiceActivityGate
+
+
+class VoicePipeline:
+    """Audio queue -> voice activity gate -> recognizer -> matcher -> executor.
+
+    The front-ends hand microphone blocks to capture() and a RecordingWorker
+    feeds them to processBlock(); the replay harness pushes WAV blocks through
+    the same object.
+    """
+
+    def __init__(self, ring, loader, matcher, executor, gate, tracer, early=None, onExit=None, resampler=None,
+                 lifecycle=None, fuzzyThreshold=None):
+        self.ring = ring
+        self.resampler = resampler
+        self.loader = loader
+        self.lifecycle = lifecycle or ModelLifecycle(loader, idleSeconds=0)
+        self.matcher = matcher
+        self.executor = executor
+        self.gate = gate
+        self.tracer = tracer
+        self.early = early
+        self.onExit = onExit
+        # lowest score of an approximate match, None for exact phrases only
+        self.fuzzyThreshold = fuzzyThreshold
+
+    def setMatcher(self, matcher):
+        """Swap in a recompiled command table; the loaded model and the audio are left alone."""
+        self.matcher = matcher
+        self.loader.setMatcher(matcher)
+        if self.early:
+            self.early.matcher = matcher
+
+    def capture(self, data):
+        """Queue one captured block, resampled to the model's rate if needed."""
+        if self.resampler:
+            data = self.resampler.process(data)
+        self.ring.write(data)
+
+    def reset(self):
+        """Forget audio and recognizer state left over from the previous session."""
+        self.gate.reset()
+        self.loader.reset()
+        if self.early:
+            self.early.reset()
+
+    def processBlock(self, data):
+        self.tracer.block(self.ring.lastCaptured, time.monotonic())
+        self.tracer.sampleQueue(len(self.ring), self.ring.lagMs)
+        texts = []
+        # silent blocks never reach the recognizer
+        for block in self.gate.process(data):
+            texts += self.loader.feed(block)
+        if self.gate.ended:
+            texts += self.loader.flush()
+        self._dispatch(texts)
+
+    def flush(self):
+        """Finish whatever utterance is in progress, e.g. at the end of a file."""
+        self._dispatch(self.loader.flush())
+
+    def _dispatch(self, texts):
+        if self.early and not texts:
+            text = self.early.partial(self.loader.partial())
+            if text:
+                print(f"Command recognized early: {text}")
+                self.execute(text)
+        for text in texts:
+            if self.early and not self.early.final(text):
+                continue
+            print(f"Command recognized: {text}")
+            self.execute(text)
+
+    def execute(self, command):
+        command = command.lower()
+        print(f"Command received: {command}")
+        trace = self.tracer.utterance(command)
+
+        try:
+            match = self.matcher.match(command, self.fuzzyThreshold)
+            trace.mark("matched")
+            if match is not None and match.score < 1.0:
+                print(f"Taking it as '{match.phrase}' (score {match.score:.2f})")
+
+            if match is None:
+                print("Command not recognized.")
+                trace.finish(None)
+
+            # Exit voice assistant
+            elif match.command.name == "exit voice":
+                print("Closing voice command assistant...")
+                trace.finish(match.command.name)
+                if self.onExit:
+                    self.onExit()
+
+            elif match.command.name == "cancel":
+                self.executor.cancel()
+                trace.finish(match.command.name)
+
+            elif match.command.name == "job status":
+                print(self.executor.status())
+                trace.finish(match.command.name)
+
+            else:
+                # runs off the recognition thread, so audio keeps being decoded
+                self.executor.submit(match, trace)
+
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+
+    def summary(self):
+        lines = [self.gate.summary()]
+        if self.early:
+            lines.append(self.early.summary())
+        recognizerSummary = getattr(self.loader.recognizer, "summary", None)
+        if recognizerSummary:
+            lines.append(recognizerSummary())
+        lines.append(self.tracer.summary())
+        lines.append(self.ring.summary())
+        lines.append(self.lifecycle.summary())
+        lines.append(VOLUME.summary())
+        return "\n".join(lines)
+
+
+def buildPipeline(args, modelPath, captureRate, blocksize, executor=None, onExit=None, socketPath=None):
+    """Wire up a pipeline from the switches in voiceCommand.options.
+
+    `captureRate` is the rate the audio arrives at; unless --capture native
+    is given it is resampled to the model's 16 kHz before the queue.
+    """
+    resampler = None
+    samplerate = captureRate
+    if captureRate != MODEL_RATE and args.capture != NATIVE:
+        resampler = Resampler(captureRate, MODEL_RATE)
+        samplerate = MODEL_RATE
+        blocksize = resampler.outputFrames(blocksize)
+        print(f"===> Resampling {captureRate} Hz capture audio to {samplerate} Hz")
+
+    VOLUME.useBackend(args.mixer)
+    VOLUME.window = args.volume_window
+    if executor is None:
+        # a supplied executor is the replay harness' dry run, which runs no "search file"
+        FILE_INDEX.path = args.file_index
+        FILE_INDEX.rescanInterval = args.rescan_interval * 60
+        FILE_INDEX.start()
+    registry = CommandRegistry(args.commands)
+    matcher = registry.matcher
+    tracer = LatencyTracer(args.trace_dir)
+    loader = ModelLoader(modelPath, samplerate, socketPath=socketPath, matcher=matcher, tracer=tracer,
+                         grammar=args.grammar, smallModelPath=args.cascade,
+                         cascadeThreshold=args.cascade_threshold, wakePhrase=args.wake_word,
+                         wakeWindow=args.wake_window)
+    ring = AudioRingBuffer(blocksize, samplerate, policy=args.overrun_policy)
+    gate = VoiceActivityGate(energyThreshold=args.vad_threshold, enabled=not args.no_vad)
+    early = EarlyDispatcher(matcher, stableBlocks=args.early_blocks) if args.early_dispatch else None
+    lifecycle = ModelLifecycle(loader, idleSeconds=args.idle_unload * 60)
+    executor = executor or CommandExecutor(limits=dict(args.concurrency or ()))
+    pipeline = VoicePipeline(ring, loader, matcher, executor, gate, tracer, early, onExit, resampler, lifecycle,
+                             fuzzyThreshold=None if args.fuzzy_threshold <= 0 else args.fuzzy_threshold)
+    registry.onReload = pipeline.setMatcher
+    registry.start()
+    return pipeline
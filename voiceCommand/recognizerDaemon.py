@@ -0,0 +1,181 @@
+# Resident speech recognizer shared by every voice front-end.
+#
+# The daemon loads the Vosk model once and serves any number of clients over a
+# Unix socket, each with its own KaldiRecognizer on the shared model. Decoding
+# runs on a pool of --workers threads, so several microphones or replayed files
+# are decoded in parallel on separate cores:
+#
+#   python3 -m voiceCommand.recognizerDaemon --model /usr/share/vosk/models/vosk-model-en-us-0.42 --workers 4
+#
+# Protocol: the client sends one JSON header line ({"samplerate": 16000}, plus
+# an optional "grammar" JSON string to restrict decoding to given phrases),
+# then audio frames, each a 4-byte big-endian length followed by int16 PCM.
+# Every frame is answered with one JSON line: {"final": false, "partial": ...}
+# while an utterance is in progress and {"final": true, "text": ...} when it
+# ends. A zero-length frame forces the final result and resets the utterance.
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import threading
+import time
+
+from voiceCommand.recognizerPool import RecognizerPool
+
+FRAME_HEADER = struct.Struct("!I")
+
+
+def defaultSocketPath():
+    runtimeDir = os.environ.get("XDG_RUNTIME_DIR") or f"/tmp/voice-recognizer-{os.getuid()}"
+    return os.path.join(runtimeDir, "voice-recognizer.sock")
+
+
+def checkSocketDir(socketPath):
+    """Refuse a socket directory another user could have made or can write to.
+
+    Without XDG_RUNTIME_DIR the socket lives under /tmp, where another local
+    user could create the directory first and serve made-up transcripts.
+    """
+    directory = os.path.dirname(socketPath) or "."
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be a directory of our own with mode 700, not shared")
+
+
+def readExactly(stream, size):
+    data = stream.read(size)
+    if data is None or len(data) < size:
+        raise EOFError("connection closed")
+    return data
+
+
+class RecognizerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        header = json.loads(self.rfile.readline() or b"{}")
+        stream = self.server.pool.open(header.get("samplerate", 16000), header.get("grammar"),
+                                       header.get("words", False))
+        self.server.attached(+1)
+        try:
+            while True:
+                (size,) = FRAME_HEADER.unpack(readExactly(self.rfile, FRAME_HEADER.size))
+                data = readExactly(self.rfile, size) if size else b""
+                final, result = stream.feed(data).result()
+                reply = json.loads(result)
+                reply["final"] = final
+                self.wfile.write(json.dumps(reply).encode() + b"\n")
+                self.wfile.flush()
+        except (EOFError, ConnectionError):
+            pass
+        finally:
+            stream.close()
+            self.server.attached(-1)
+
+
+class RecognizerServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socketPath, pool):
+        self.pool = pool
+        self.clients = 0
+        self.clientsLock = threading.Lock()
+        super().__init__(socketPath, RecognizerHandler)
+
+    def attached(self, delta):
+        with self.clientsLock:
+            self.clients += delta
+            print(f"Clients attached: {self.clients}")
+
+
+class RemoteRecognizer:
+    """Client side of the daemon with the KaldiRecognizer interface the loader uses."""
+
+    def __init__(self, socketPath, samplerate, words=False, grammar=None, timeout=5.0):
+        checkSocketDir(socketPath)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(socketPath)
+        self.reader = self.sock.makefile("rb")
+        self.header = {"samplerate": samplerate, "words": words, "grammar": grammar}
+        self.sock.sendall(json.dumps(self.header).encode() + b"\n")
+        self.last = {}
+
+    def _send(self, data):
+        self.sock.sendall(FRAME_HEADER.pack(len(data)) + data)
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("recognizer daemon closed the connection")
+        self.last = json.loads(line)
+        return self.last.pop("final")
+
+    def SetWords(self, words):
+        # Fixed for the lifetime of the connection by the header
+        pass
+
+    def AcceptWaveform(self, data):
+        return self._send(bytes(data)) if data else False
+
+    def Result(self):
+        return json.dumps(self.last)
+
+    def PartialResult(self):
+        return json.dumps(self.last)
+
+    def FinalResult(self):
+        self._send(b"")
+        return json.dumps(self.last)
+
+    def Reset(self):
+        self._send(b"")
+        self.last = {}
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared offline speech recognizer")
+    parser.add_argument("--model", required=True, help="path to the Vosk model directory")
+    parser.add_argument("--socket", default=defaultSocketPath(), help="Unix socket to listen on")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="decoding threads shared by all clients (default: one per core)")
+    args = parser.parse_args()
+
+    import vosk
+
+    print(f"===> Loading {args.model}...")
+    start = time.monotonic()
+    model = vosk.Model(args.model)
+    print(f"===> Model ready in {time.monotonic() - start:.1f}s")
+
+    os.makedirs(os.path.dirname(args.socket), mode=0o700, exist_ok=True)
+    try:
+        checkSocketDir(args.socket)
+    except OSError as e:
+        print(f"Not listening on {args.socket}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+    pool = RecognizerPool(lambda samplerate, grammar: (
+        vosk.KaldiRecognizer(model, samplerate, grammar) if grammar else vosk.KaldiRecognizer(model, samplerate)),
+        args.workers)
+    server = RecognizerServer(args.socket, pool)
+    os.chmod(args.socket, 0o600)
+    print(f"===> Listening on {args.socket} with {pool.workers} decoding threads")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(args.socket)
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class RecognizerStream:
+    """One audio source, decoded by its own recognizer on one of the pool's workers."""
+
+    def __init__(self, pool, worker, recognizer, onResult=None):
+        self.pool = pool
+        self.worker = worker
+        self.recognizer = recognizer
+        self.onResult = onResult
+
+    def feed(self, data):
+        """Queue a block; the future resolves to (final, result JSON)."""
+        return self.pool._submit(self, bytes(data))
+
+    def finish(self):
+        """Queue the end of the utterance; resolves to (True, final result JSON)."""
+        return self.pool._submit(self, b"")
+
+    def close(self):
+        self.pool._release(self)
+
+
+class RecognizerPool:
+    """Decodes many audio streams on a fixed set of threads sharing one model.
+
+    Each stream gets its own KaldiRecognizer from `makeRecognizer(samplerate,
+    grammar)`, normally built on a single vosk.Model, so extra sources cost a
+    recognizer and not another copy of the model. Vosk releases the GIL while
+    it decodes, so the workers run on separate cores. A stream is pinned to
+    the worker serving the fewest streams, which keeps its blocks in order.
+    """
+
+    def __init__(self, makeRecognizer, workers=None):
+        self.makeRecognizer = makeRecognizer
+        self.workers = workers or os.cpu_count() or 1
+        self.queues = [queue.Queue() for _ in range(self.workers)]
+        self.streams = [0] * self.workers
+        self.lock = threading.Lock()
+        self.threads = [threading.Thread(target=self._work, args=(tasks,), daemon=True, name=f"recognizer-{index}")
+                        for index, tasks in enumerate(self.queues)]
+        for thread in self.threads:
+            thread.start()
+
+    def open(self, samplerate, grammar=None, words=False, onResult=None):
+        """Start a stream; `onResult(stream, result)` is called on the worker for every final result."""
+        recognizer = self.makeRecognizer(samplerate, grammar)
+        recognizer.SetWords(words)
+        with self.lock:
+            worker = self.streams.index(min(self.streams))
+            self.streams[worker] += 1
+        return RecognizerStream(self, worker, recognizer, onResult)
+
+    def _release(self, stream):
+        with self.lock:
+            self.streams[stream.worker] -= 1
+
+    def _submit(self, stream, data):
+        future = Future()
+        self.queues[stream.worker].put((stream, data, future))
+        return future
+
+    def _work(self, tasks):
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            stream, data, future = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                recognizer = stream.recognizer
+                if not data:
+                    final, result = True, recognizer.FinalResult()
+                elif recognizer.AcceptWaveform(data):
+                    final, result = True, recognizer.Result()
+                else:
+                    final, result = False, recognizer.PartialResult()
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            future.set_result((final, result))
+            if final and stream.onResult:
+                stream.onResult(stream, result)
+
+    def shutdown(self):
+        for tasks in self.queues:
+            tasks.put(None)
+        for thread in self.threads:
+            thread.join()
@@ -0,0 +1,83 @@
+import threading
+import time
+
+
+class RecordingWorker:
+    """One input stream and one decoding thread for the whole session.
+
+    The stream is opened on the first resume() and afterwards only stopped
+    and restarted, and the thread waits on an event while recording is off,
+    so toggling the microphone creates no threads and no file descriptors.
+    Resuming clears the audio queue and, on the worker thread before the
+    next block is decoded, the recognizer, gate and early-dispatch state, so
+    nothing from the previous session is decoded.
+    """
+
+    def __init__(self, pipeline, openStream):
+        self.pipeline = pipeline
+        self.openStream = openStream
+        self.stream = None
+        self.active = threading.Event()
+        self.resetPending = False
+        self.closed = False
+        self.toggleMs = []
+        self.thread = threading.Thread(target=self._run, daemon=True, name="recording")
+        self.thread.start()
+
+    def resume(self):
+        start = time.perf_counter()
+        if self.stream is None:
+            self.stream = self.openStream()
+        # the stream is stopped, so nothing can land in the queue while it is cleared
+        self.pipeline.ring.clear()
+        self.resetPending = True
+        self.active.set()
+        self.stream.start()
+        self._toggled(start, "resume")
+
+    def pause(self):
+        start = time.perf_counter()
+        self.active.clear()
+        if self.stream is not None:
+            # abort drops what PortAudio still holds instead of draining it
+            self.stream.abort()
+        self._toggled(start, "pause")
+        print(self.pipeline.summary())
+        print(self.summary())
+
+    def _toggled(self, start, what):
+        elapsed = (time.perf_counter() - start) * 1000
+        self.toggleMs.append(elapsed)
+        print(f"Microphone {what} took {elapsed:.1f} ms")
+
+    def _run(self):
+        ring = self.pipeline.ring
+        while True:
+            self.active.wait()
+            if self.closed:
+                return
+            if self.resetPending:
+                self.resetPending = False
+                self.pipeline.reset()
+            data = ring.read(timeout=0.2)
+            if data is not None and self.active.is_set():
+                self.pipeline.processBlock(data)
+
+    def close(self):
+        self.closed = True
+        self.active.clear()
+        if self.stream is not None:
+            self.stream.abort()
+            self.stream.close()
+            self.stream = None
+        # wake the thread so it sees `closed` and exits; "exit voice" closes from the thread itself
+        self.active.set()
+        if threading.current_thread() is not self.thread:
+            self.thread.join(timeout=1.0)
+
+    def summary(self):
+        if not self.toggleMs:
+            return "Microphone toggles: none"
+        toggles = sorted(self.toggleMs)
+        return (f"Microphone toggles: {len(toggles)}, p50 {toggles[len(toggles) // 2]:.1f} ms, "
+                f"max {toggles[-1]:.1f} ms")
@@ -0,0 +1,101 @@
+# Replay WAV files through the recognition pipeline without a microphone.
+#
+#   python3 -m voiceCommand.replay --model /usr/share/vosk/models/vosk-model-en-us-0.22 utterances/
+#   python3 -m voiceCommand.replay --model ... --labels labels.tsv --jsonl results.jsonl *.wav
+#
+# Files are labelled with the command they should trigger, either by a
+# tab-separated labels file (path<TAB>command) or by the name of the directory
+# they sit in ("utterances/volume up/take1.wav"); a "none" label means nothing
+# should run. Commands are never executed, the dry-run executor only records
+# what would have run.
+
+import argparse
+import json
+import sys
+import time
+
+from voiceCommand.commandExecutor import DryRunExecutor
+from voiceCommand.options import addPipelineArguments
+from voiceCommand.pipeline import buildPipeline
+from voiceCommand.wavFiles import expectedCommand, findWavs, readLabels, readWavBlocks
+
+
+def replay(args):
+    wavs = findWavs(args.wavs)
+    if not wavs:
+        sys.exit("No WAV files to replay.")
+    labels = readLabels(args.labels) if args.labels else None
+
+    samplerate, _ = readWavBlocks(wavs[0], args.blocksize)
+    executor = DryRunExecutor()
+    pipeline = buildPipeline(args, args.model, samplerate, args.blocksize, executor=executor,
+                             socketPath=args.socket or "")
+    commandNames = {command.name for command in pipeline.matcher.commands}
+
+    loadStart = time.monotonic()
+    pipeline.loader.start()
+    while not pipeline.loader.ready.wait(0.1):
+        if pipeline.loader.state == "failed":
+            sys.exit(f"Could not load the model {args.model}")
+    print(f"Model ready in {time.monotonic() - loadStart:.2f}s", file=sys.stderr)
+
+    output = open(args.jsonl, "w") if args.jsonl else None
+    audioSeconds = decodeSeconds = 0.0
+    labelled = correct = 0
+    for path in wavs:
+        rate, blocks = readWavBlocks(path, args.blocksize)
+        if rate != samplerate:
+            print(f"Skipping {path}: {rate} Hz, the recognizer runs at {samplerate} Hz", file=sys.stderr)
+            continue
+        del executor.actions[:]
+        start = time.perf_counter()
+        # the same ring -> gate -> recognizer -> matcher path the microphone feeds
+        for block in blocks:
+            pipeline.capture(block)
+            pipeline.processBlock(pipeline.ring.read(timeout=0))
+        pipeline.flush()
+        elapsed = time.perf_counter() - start
+        seconds = sum(len(block) for block in blocks) / 2 / samplerate
+        audioSeconds += seconds
+        decodeSeconds += elapsed
+
+        commands = [action["command"] for action in executor.actions]
+        expected = expectedCommand(path, labels, commandNames)
+        record = {"path": path, "audioSeconds": round(seconds, 3), "rtf": round(elapsed / seconds, 4),
+                  "actions": list(executor.actions)}
+        if expected is not None:
+            labelled += 1
+            ok = commands == ([] if expected == "none" else [expected])
+            correct += ok
+            record.update(expected=expected, correct=ok)
+        if output:
+            output.write(json.dumps(record) + "\n")
+        if args.verbose or (expected is not None and not record["correct"]):
+            print(f"{path}: {commands or 'nothing'}" + (f" (expected {expected})" if expected else ""))
+    if output:
+        output.close()
+
+    print(f"Replayed {len(wavs)} files, {audioSeconds:.1f}s of audio in {decodeSeconds:.1f}s "
+          f"(real-time factor {decodeSeconds / max(audioSeconds, 1e-9):.3f})")
+    if labelled:
+        print(f"Command accuracy: {correct}/{labelled} ({100.0 * correct / labelled:.1f}%)")
+    print(pipeline.summary())
+    pipeline.tracer.close()
+    return 0 if labelled == correct else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay WAV files through the voice command pipeline")
+    parser.add_argument("--model", required=True, help="path of the Vosk model directory")
+    parser.add_argument("--socket", help="decode on a running recognizer daemon instead of loading the model")
+    parser.add_argument("--labels", help="tab-separated file of WAV path and expected command")
+    parser.add_argument("--blocksize", type=int, default=1024, help="frames per audio block (default: %(default)s)")
+    parser.add_argument("--jsonl", help="write one JSON result per file to this path")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    addPipelineArguments(parser)
+    parser.add_argument("wavs", nargs="+", help="16-bit mono WAV files or directories of them")
+    sys.exit(replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
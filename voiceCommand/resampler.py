@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+
+# The en-us Vosk models are trained on 16 kHz audio
+MODEL_RATE = 16000
+
+RESAMPLE = "resample"
+PORTAUDIO = "portaudio"
+NATIVE = "native"
+CAPTURE_MODES = (RESAMPLE, PORTAUDIO, NATIVE)
+
+
+class Resampler:
+    """Streaming polyphase resampler for int16 mono blocks.
+
+    The rate ratio is reduced to up/down and a Kaiser-windowed sinc low-pass
+    is split into `up` phases of `taps` coefficients each. Every output sample
+    of a block is computed at once: its input window is gathered with fancy
+    indexing and multiplied by the phase it falls on. The last `taps - 1`
+    input samples are carried over, so block boundaries leave no seams.
+    """
+
+    def __init__(self, inputRate, outputRate=MODEL_RATE, zeroCrossings=8, beta=8.6):
+        divisor = math.gcd(int(inputRate), int(outputRate))
+        self.up = int(outputRate) // divisor
+        self.down = int(inputRate) // divisor
+        self.inputRate = inputRate
+        self.outputRate = outputRate
+
+        # low-pass at the lower of the two Nyquist rates, designed at up * inputRate
+        cutoff = 0.5 / max(self.up, self.down)
+        self.taps = math.ceil(2 * zeroCrossings * max(self.up, self.down) / self.up)
+        length = self.taps * self.up
+        t = np.arange(length) - (length - 1) / 2
+        h = 2 * cutoff * np.sinc(2 * cutoff * t) * np.kaiser(length, beta) * self.up
+        # bank[p, k] = h[p + k * up]: coefficient k of phase p
+        self.bank = h.reshape(self.taps, self.up).T.astype(np.float32)
+        self.offsets = np.arange(self.taps)
+
+        self.history = np.zeros(self.taps - 1, dtype=np.float32)
+        # next output position relative to the start of history, in 1/up input samples
+        self.position = (self.taps - 1) * self.up
+
+    def process(self, data):
+        """Resample one block of int16 bytes and return int16 bytes."""
+        samples = np.concatenate((self.history, np.frombuffer(data, dtype=np.int16).astype(np.float32)))
+        # every output whose input window ends inside this block
+        end = len(samples) * self.up
+        count = (end - 1 - self.position) // self.down + 1 if self.position < end else 0
+
+        positions = self.position + self.down * np.arange(count)
+        index, phase = np.divmod(positions, self.up)
+        windows = samples[index[:, None] - self.offsets]
+        output = np.einsum("nk,nk->n", windows, self.bank[phase])
+
+        consumed = len(samples) - (self.taps - 1)
+        self.history = samples[consumed:]
+        self.position += self.down * count - consumed * self.up
+        return np.clip(np.rint(output), -32768, 32767).astype(np.int16).tobytes()
+
+    def outputFrames(self, inputFrames):
+        """Most frames one input block of `inputFrames` can produce."""
+        return math.ceil(inputFrames * self.up / self.down) + 1
+
+
+def captureRate(deviceRate, mode, device=None):
+    """Pick the rate to open the microphone at.
+
+    `resample` keeps the device's native rate and resamples in the pipeline.
+    `portaudio` asks PortAudio for 16 kHz directly and falls back to
+    resampling when the device cannot do it. `native` decodes at the device
+    rate, as before.
+    """
+    if mode == PORTAUDIO and deviceRate != MODEL_RATE:
+        import sounddevice as sd
+
+        try:
+            sd.check_input_settings(device=device, samplerate=MODEL_RATE, channels=1, dtype="int16")
+            return MODEL_RATE
+        except Exception as e:
+            print(f"Device cannot capture at {MODEL_RATE} Hz, resampling instead: {e}")
+    return deviceRate
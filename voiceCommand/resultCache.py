@@ -0,0 +1,56 @@
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ResultCache:
+    """Output of status commands, kept for a per-command time to live.
+
+    A fresh entry is returned as is. An entry older than its TTL is still
+    returned straight away, and a refresh is started in the background so
+    the next query gets current data; only a key that was never stored
+    makes the caller wait for the command.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.refreshing = set()
+        self.lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-refresh")
+        self.hits = 0
+        self.staleHits = 0
+        self.misses = 0
+
+    def lookup(self, key, ttl, refresh):
+        """Cached value for key, or None on a miss; `refresh()` recomputes a stale one."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, storedAt = entry
+            if time.monotonic() - storedAt <= ttl:
+                self.hits += 1
+                return value
+            self.staleHits += 1
+            if key not in self.refreshing:
+                self.refreshing.add(key)
+                self.pool.submit(self._refresh, key, refresh)
+            return value
+
+    def store(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic())
+
+    def _refresh(self, key, refresh):
+        try:
+            self.store(key, refresh())
+        except Exception as e:
+            print(f"Could not refresh {key[0]}: {e}", file=sys.stderr)
+        finally:
+            with self.lock:
+                self.refreshing.discard(key)
+
+    def summary(self):
+        return f"Status cache: {self.hits} hits, {self.staleHits} stale hits, {self.misses} misses"
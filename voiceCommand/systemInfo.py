@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+
+from voiceCommand.modelLifecycle import formatBytes
+
+
+def readFile(path, default=None):
+    try:
+        with open(path) as sysFile:
+            return sysFile.read().strip()
+    except OSError:
+        return default
+
+
+class CpuUsage:
+    """CPU utilisation from the deltas between two samples of /proc/stat.
+
+    read() reports the share of time spent busy since the previous read(),
+    overall and per core, which suits a poller such as the tray tooltip; the
+    first read reports the average since boot. read(interval) instead takes
+    two samples `interval` seconds apart and leaves the poller's sample alone.
+    """
+
+    def __init__(self, root="/"):
+        self.path = os.path.join(root, "proc/stat")
+        self.previous = {}
+        self.lock = threading.Lock()
+
+    def sample(self):
+        # cpu  user nice system idle iowait irq softirq steal ...
+        times = {}
+        with open(self.path) as stat:
+            for line in stat:
+                if not line.startswith("cpu"):
+                    break
+                fields = line.split()
+                values = [int(value) for value in fields[1:9]]
+                idle = values[3] + values[4]
+                times[fields[0]] = (sum(values) - idle, sum(values))
+        return times
+
+    def read(self, interval=None):
+        if interval:
+            previous = self.sample()
+            time.sleep(interval)
+            times = self.sample()
+        else:
+            times = self.sample()
+            with self.lock:
+                previous, self.previous = self.previous, times
+        usage = {}
+        for name, (busy, total) in times.items():
+            lastBusy, lastTotal = previous.get(name, (0, 0))
+            elapsed = total - lastTotal
+            usage[name] = 100.0 * (busy - lastBusy) / elapsed if elapsed > 0 else 0.0
+        cores = [usage[name] for name in sorted(usage, key=lambda name: int(name[3:] or -1)) if name != "cpu"]
+        return {"percent": usage.get("cpu", 0.0), "cores": cores}
+
+
+class MemoryInfo:
+    """Memory and swap from /proc/meminfo, in bytes."""
+
+    def __init__(self, root="/"):
+        self.path = os.path.join(root, "proc/meminfo")
+
+    def read(self):
+        values = {}
+        with open(self.path) as meminfo:
+            for line in meminfo:
+                key, _, rest = line.partition(":")
+                values[key] = int(rest.split()[0]) * 1024
+        total = values.get("MemTotal", 0)
+        available = values.get("MemAvailable", values.get("MemFree", 0))
+        swapTotal = values.get("SwapTotal", 0)
+        return {"total": total, "available": available, "used": total - available,
+                "swapTotal": swapTotal, "swapUsed": swapTotal - values.get("SwapFree", 0)}
+
+
+class BatteryInfo:
+    """Batteries under /sys/class/power_supply; an empty list on a desktop."""
+
+    def __init__(self, root="/"):
+        self.path = os.path.join(root, "sys/class/power_supply")
+
+    def read(self):
+        batteries = []
+        try:
+            names = sorted(os.listdir(self.path))
+        except OSError:
+            return batteries
+        for name in names:
+            supply = os.path.join(self.path, name)
+            if readFile(os.path.join(supply, "type")) != "Battery":
+                continue
+            capacity = readFile(os.path.join(supply, "capacity"))
+            batteries.append({"name": name, "status": readFile(os.path.join(supply, "status"), "Unknown"),
+                              "percent": int(capacity) if capacity else None})
+        return batteries
+
+
+class NetworkInfo:
+    """Interfaces under /sys/class/net, without the loopback."""
+
+    def __init__(self, root="/"):
+        self.path = os.path.join(root, "sys/class/net")
+
+    def read(self):
+        interfaces = []
+        try:
+            names = sorted(os.listdir(self.path))
+        except OSError:
+            return interfaces
+        for name in names:
+            interface = os.path.join(self.path, name)
+            if name == "lo":
+                continue
+            statistics = os.path.join(interface, "statistics")
+            interfaces.append({"name": name, "state": readFile(os.path.join(interface, "operstate"), "unknown"),
+                               "wireless": os.path.isdir(os.path.join(interface, "wireless")),
+                               "rxBytes": int(readFile(os.path.join(statistics, "rx_bytes"), "0")),
+                               "txBytes": int(readFile(os.path.join(statistics, "tx_bytes"), "0"))})
+        return interfaces
+
+
+class SystemInfo:
+    """System status read in-process, for the info commands and the tray tooltip.
+
+    query() returns structured results from the providers; describe() and
+    tooltip() format them. `root` points every provider at another tree, e.g.
+    a copy of /proc and /sys taken on a laptop.
+    """
+
+    def __init__(self, root="/"):
+        self.providers = {"cpu": CpuUsage(root), "memory": MemoryInfo(root), "battery": BatteryInfo(root),
+                          "network": NetworkInfo(root)}
+
+    def query(self, *names):
+        return {name: self.providers[name].read() for name in names or self.providers}
+
+    def describe(self, name):
+        # a spoken answer reports the load right now, not since the tooltip's last poll
+        value = self.providers[name].read(0.2) if name == "cpu" else self.providers[name].read()
+        if name == "cpu":
+            cores = " ".join(f"{percent:.0f}%" for percent in value["cores"])
+            return f"CPU usage: {value['percent']:.1f}% (cores: {cores})"
+        if name == "memory":
+            return (f"Memory: {formatBytes(value['used'])} used of {formatBytes(value['total'])}, "
+                    f"{formatBytes(value['available'])} available; "
+                    f"swap {formatBytes(value['swapUsed'])} of {formatBytes(value['swapTotal'])}")
+        if name == "battery":
+            if not value:
+                return "No battery found."
+            return "\n".join(f"Battery {battery['name']}: {battery['status']}, {battery['percent']}%"
+                             for battery in value)
+        if not value:
+            return "No network interfaces found."
+        return "\n".join(f"{interface['name']}: {interface['state']}"
+                         f"{' (wireless)' if interface['wireless'] else ''}, "
+                         f"received {formatBytes(interface['rxBytes'])}, sent {formatBytes(interface['txBytes'])}"
+                         for interface in value)
+
+    def tooltip(self):
+        status = self.query("cpu", "memory", "battery")
+        memory = status["memory"]
+        parts = [f"CPU {status['cpu']['percent']:.0f}%",
+                 f"Mem {formatBytes(memory['used'])}/{formatBytes(memory['total'])}"]
+        parts += [f"Bat {battery['percent']}%" for battery in status["battery"]]
+        return ", ".join(parts)
+
+
+SYSTEM_INFO = SystemInfo()
@@ -0,0 +1,58 @@
+import sys
+import tkinter as tk
+
+from voiceCommand.engine import VoiceEngine
+
+
+class VoiceCommandWidget:
+    def __init__(self, root, engine):
+        self.root = root
+        self.engine = engine
+        self.root.title("Offline Voice Command Assistant")
+
+        self.label = tk.Label(self.root, text="Loading model...", font=('Arial', 16))
+        self.label.pack(pady=10)
+
+        self.micButton = tk.Button(self.root, text="Start Mic", command=self.toggleMic)
+        self.micButton.status = "close"
+        self.micButton.pack(pady=10)
+
+        self.showModelState()
+
+    def showModelState(self):
+        # the mic can be opened right away; audio is buffered until the model is ready
+        pipeline = self.engine.pipeline
+        if pipeline.loader.state == "ready":
+            self.label.config(text="Microphone")
+            print(pipeline.lifecycle.summary())
+        elif pipeline.loader.state == "failed":
+            self.label.config(text="Model failed to load")
+        elif pipeline.loader.state != "unloaded":
+            self.label.config(text="Loading model...")
+            self.root.after(200, self.showModelState)
+
+    def toggleMic(self):
+        if self.micButton.status == "close":
+            self.micButton.config(text="Close Mic")
+            self.micButton.status = "open"
+            self.engine.startRecording()
+            self.showModelState()
+        elif self.micButton.status == "open":
+            self.micButton.config(text="Start Mic")
+            self.micButton.status = "close"
+            self.engine.stopRecording()
+
+    def closeApp(self):
+        self.engine.close()
+        self.root.quit()
+        sys.exit()
+
+
+def run(args):
+    engine = VoiceEngine(args, args.model)
+    engine.start()
+    root = tk.Tk()
+    app = VoiceCommandWidget(root, engine)
+    engine.onExit = app.closeApp
+    root.after_idle(engine.pipeline.loader.markInteractive)
+    root.mainloop()
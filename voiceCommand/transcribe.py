@@ -0,0 +1,138 @@
+# Transcribe a corpus of recorded commands on all cores.
+#
+#   python3 -m voiceCommand.transcribe --model /usr/share/vosk/models/vosk-model-en-us-0.22 \
+#       --output results.jsonl recordings/
+#   python3 -m voiceCommand.transcribe --model ... --manifest corpus.tsv --output results.jsonl --resume
+#
+# Every file is decoded in a pool of processes that each load the model once.
+# The transcripts go through the command matcher the front-ends use, with a
+# dry-run executor, and one JSON line per file is written as soon as it is
+# done. A manifest lists one WAV path per line, optionally followed by a tab
+# and the command it should trigger. With --resume, files already in the
+# output are skipped and new results are appended.
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from voiceCommand.commandExecutor import DryRunExecutor
+from voiceCommand.commandRegistry import CommandRegistry
+from voiceCommand.wavFiles import expectedCommand, findWavs, readLabels, readWavBlocks
+
+model = None
+
+
+def loadModel(modelPath):
+    # runs once in every worker process
+    global model
+    import vosk
+
+    vosk.SetLogLevel(-1)
+    model = vosk.Model(modelPath)
+
+
+def decodeFile(path):
+    import vosk
+
+    start = time.process_time()
+    samplerate, blocks = readWavBlocks(path, 4000)
+    recognizer = vosk.KaldiRecognizer(model, samplerate)
+    texts = []
+    for block in blocks:
+        if recognizer.AcceptWaveform(block):
+            texts.append(json.loads(recognizer.Result()).get("text", ""))
+    texts.append(json.loads(recognizer.FinalResult()).get("text", ""))
+    audioSeconds = sum(len(block) for block in blocks) / 2 / samplerate
+    return {"path": path, "audioSeconds": round(audioSeconds, 3),
+            "cpuSeconds": round(time.process_time() - start, 3), "texts": [text for text in texts if text]}
+
+
+def finishedPaths(outputPath):
+    """Paths already in the output; a line cut off by an interrupted run is dropped."""
+    if not os.path.exists(outputPath):
+        return set()
+    records = []
+    with open(outputPath) as output:
+        for line in output:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    with open(outputPath, "w") as output:
+        output.writelines(json.dumps(record) + "\n" for record in records)
+    return {record["path"] for record in records}
+
+
+def transcribe(args):
+    labels = readLabels(args.manifest) if args.manifest else None
+    paths = findWavs(args.wavs) + sorted(labels or ())
+    if not paths:
+        sys.exit("No WAV files to transcribe.")
+    done = finishedPaths(args.output) if args.resume else set()
+    todo = [path for path in paths if os.path.normpath(path) not in done]
+    print(f"{len(todo)} files to transcribe, {len(paths) - len(todo)} already done", file=sys.stderr)
+
+    # the same table and matching rules as buildPipeline
+    matcher = CommandRegistry(args.commands).matcher
+    threshold = None if args.fuzzy_threshold <= 0 else args.fuzzy_threshold
+    commandNames = {command.name for command in matcher.commands}
+    labelled = correct = 0
+    audioSeconds = 0.0
+    start = time.perf_counter()
+    with open(args.output, "a" if args.resume else "w", buffering=1) as output, \
+            ProcessPoolExecutor(max_workers=args.jobs, initializer=loadModel, initargs=(args.model,)) as pool:
+        futures = [pool.submit(decodeFile, path) for path in todo]
+        for count, future in enumerate(as_completed(futures), 1):
+            try:
+                record = future.result()
+            except Exception as e:
+                print(f"Could not transcribe: {e}", file=sys.stderr)
+                continue
+            record["path"] = os.path.normpath(record["path"])
+            executor = DryRunExecutor()
+            for text in record["texts"]:
+                match = matcher.match(text, threshold)
+                if match is not None:
+                    executor.submit(match)
+            record["actions"] = executor.actions
+            expected = expectedCommand(record["path"], labels, commandNames)
+            if expected is not None:
+                commands = [action["command"] for action in executor.actions]
+                record["expected"] = expected
+                record["correct"] = commands == ([] if expected == "none" else [expected])
+                labelled += 1
+                correct += record["correct"]
+            output.write(json.dumps(record) + "\n")
+            audioSeconds += record["audioSeconds"]
+            if count % 50 == 0:
+                wall = time.perf_counter() - start
+                print(f"{count}/{len(todo)} files, {audioSeconds / wall:.1f} audio s per wall s", file=sys.stderr)
+
+    wall = time.perf_counter() - start
+    print(f"Transcribed {len(todo)} files, {audioSeconds:.0f}s of audio in {wall:.1f}s "
+          f"({audioSeconds / max(wall, 1e-9):.1f} audio s per wall s with {args.jobs} workers)")
+    if labelled:
+        print(f"Command accuracy: {correct}/{labelled} ({100.0 * correct / labelled:.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcribe recorded commands in parallel")
+    parser.add_argument("--model", required=True, help="path of the Vosk model directory")
+    parser.add_argument("--manifest", help="file listing WAV paths, each optionally followed by a tab and "
+                                           "the expected command")
+    parser.add_argument("--output", required=True, help="JSONL file to write the results to")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: one per core)")
+    parser.add_argument("--resume", action="store_true", help="skip files already in the output and append")
+    parser.add_argument("--commands", metavar="JSON", help="load the command table from this file")
+    parser.add_argument("--fuzzy-threshold", type=float, default=0.8,
+                        help="lowest score (0-1) at which a transcript that only resembles a command phrase "
+                             "still matches it, 0 for exact phrases only (default: %(default)s)")
+    parser.add_argument("wavs", nargs="*", help="16-bit mono WAV files or directories of them")
+    transcribe(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
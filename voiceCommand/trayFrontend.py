@@ -0,0 +1,116 @@
+import threading
+import time
+
+import pystray
+from pystray import MenuItem as item
+from PIL import Image, ImageDraw
+
+from voiceCommand.engine import VoiceEngine
+from voiceCommand.systemInfo import SYSTEM_INFO
+
+
+def create_image(color):
+    # Create a mic icon image
+    width = 64
+    height = 64
+    image = Image.new('RGB', (width, height), color=(255, 255, 255))
+    draw = ImageDraw.Draw(image)
+
+    # Draw mic base (circle)
+    mic_center = (width // 2, height // 3)
+    mic_radius = 16
+    draw.ellipse(
+        (mic_center[0] - mic_radius, mic_center[1] - mic_radius,
+         mic_center[0] + mic_radius, mic_center[1] + mic_radius),
+        fill=color
+    )
+
+    # Draw mic handle (rectangle)
+    handle_width = 10
+    handle_height = 20
+    handle_top = mic_center[1] + mic_radius
+    draw.rectangle(
+        (mic_center[0] - handle_width // 2, handle_top,
+         mic_center[0] + handle_width // 2, handle_top + handle_height),
+        fill=color
+    )
+
+    # Draw mic stand (line)
+    stand_height = 10
+    stand_top = handle_top + handle_height
+    draw.line(
+        [(mic_center[0], stand_top), (mic_center[0], stand_top + stand_height)],
+        fill=color, width=3
+    )
+
+    return image
+
+
+class TrayApp:
+    """System tray icon; its menu toggles the microphone.
+
+    The "status" icon is green while recording and red when stopped, the
+    "plain" one black; both are orange or gray while the model loads.
+    """
+
+    def __init__(self, engine, iconStyle="status"):
+        self.engine = engine
+        self.iconStyle = iconStyle
+        self.icon = pystray.Icon("VoiceCommand")
+        self.icon.menu = pystray.Menu(
+            item('Toggle Voice Command', self.toggle_voice_command),
+            item('Quit', self.on_quit)
+        )
+        engine.onExit = self.closeApp
+        engine.pipeline.loader.onStateChange = lambda state: self.update_icon()
+        self.update_icon()
+
+    def iconColor(self):
+        loading = self.engine.loading()
+        if self.iconStyle == "plain":
+            return "gray" if loading else "black"
+        if loading:
+            return (255, 165, 0)
+        # Green if recording, Red if stopped
+        return (0, 255, 0) if self.engine.is_recording else (255, 0, 0)
+
+    def update_icon(self):
+        self.icon.icon = create_image(self.iconColor())
+        self.update_title()
+
+    def update_title(self):
+        if self.engine.loading():
+            self.icon.title = "Voice Command (loading model...)"
+        else:
+            self.icon.title = (f"Voice Command - {self.engine.pipeline.lifecycle.summary()}\n"
+                               f"{SYSTEM_INFO.tooltip()}")
+
+    def poll_status(self):
+        # the tooltip's system status is read from /proc and /sys in-process, so polling forks nothing
+        while True:
+            time.sleep(5)
+            self.update_title()
+
+    def on_setup(self, icon):
+        icon.visible = True
+        self.engine.pipeline.loader.markInteractive()
+        threading.Thread(target=self.poll_status, daemon=True).start()
+
+    def toggle_voice_command(self, icon, _):
+        self.engine.toggleRecording()
+        self.update_icon()
+
+    def on_quit(self, icon, _):
+        self.closeApp()
+
+    def closeApp(self):
+        self.engine.close()
+        self.icon.stop()
+
+    def run(self):
+        self.engine.start()
+        self.icon.run(setup=self.on_setup)
+
+
+def run(args):
+    TrayApp(VoiceEngine(args, args.model), args.tray_icon).run()
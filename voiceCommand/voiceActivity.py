@@ -0,0 +1,80 @@
+import collections
+
+import numpy as np
+
+
+class VoiceActivityGate:
+    """Cheap energy / zero-crossing gate that keeps silence away from the recognizer.
+
+    A block counts as speech when its RMS energy clears both a fixed floor and a
+    multiple of the running noise level, and its zero-crossing rate is low
+    enough not to be hiss. Speech is passed on together with a few blocks of
+    pre-roll so word onsets are not clipped, and keeps being passed for a
+    hangover period after the last speech block. When the hangover runs out,
+    `ended` is set so the caller can finish the utterance right away instead of
+    waiting for the recognizer's own end-of-utterance silence.
+    """
+
+    def __init__(self, energyThreshold=300.0, noiseRatio=3.0, maxZeroCrossingRate=0.35,
+                 preRollBlocks=5, hangoverBlocks=10, enabled=True):
+        self.energyThreshold = energyThreshold
+        self.noiseRatio = noiseRatio
+        self.maxZeroCrossingRate = maxZeroCrossingRate
+        self.hangoverBlocks = hangoverBlocks
+        self.enabled = enabled
+        self.preRoll = collections.deque(maxlen=preRollBlocks)
+        self.noiseLevel = energyThreshold / noiseRatio
+        self.hangover = 0
+        self.ended = False
+        self.decodedBlocks = 0
+        self.droppedBlocks = 0
+
+    def isSpeech(self, data):
+        samples = np.frombuffer(data, dtype=np.int16).astype(np.float32)
+        if samples.size < 2:
+            return False
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        signs = np.signbit(samples)
+        zeroCrossingRate = np.count_nonzero(signs[1:] != signs[:-1]) / samples.size
+        speech = (rms > max(self.energyThreshold, self.noiseLevel * self.noiseRatio)
+                  and zeroCrossingRate < self.maxZeroCrossingRate)
+        if not speech:
+            # Track the background level so a noisy room raises the bar
+            self.noiseLevel = 0.95 * self.noiseLevel + 0.05 * rms
+        return speech
+
+    def process(self, data):
+        """Return the blocks that should be decoded for this input block."""
+        self.ended = False
+        if not self.enabled:
+            self.decodedBlocks += 1
+            return [data]
+
+        if self.isSpeech(data):
+            blocks = list(self.preRoll) if self.hangover == 0 else []
+            self.preRoll.clear()
+            blocks.append(data)
+            self.hangover = self.hangoverBlocks
+        elif self.hangover:
+            blocks = [data]
+            self.hangover -= 1
+            self.ended = self.hangover == 0
+        else:
+            if len(self.preRoll) == self.preRoll.maxlen:
+                self.droppedBlocks += 1
+            self.preRoll.append(data)
+            return []
+
+        self.decodedBlocks += len(blocks)
+        return blocks
+
+    def reset(self):
+        """Forget the speech state of the previous recording session."""
+        self.preRoll.clear()
+        self.hangover = 0
+        self.ended = False
+
+    def summary(self):
+        total = self.decodedBlocks + self.droppedBlocks
+        skipped = 100.0 * self.droppedBlocks / total if total else 0.0
+        return f"VAD: {self.decodedBlocks} blocks decoded, {self.droppedBlocks} skipped ({skipped:.0f}%)"
@@ -0,0 +1,156 @@
+import collections
+import json
+import time
+
+
+class WakeWordRecognizer:
+    """Keeps the full recognizer asleep until a wake phrase is heard.
+
+    While asleep, audio only goes through `spotter`, a recognizer restricted
+    to the wake phrase and "[unk]", and the last `preRollSeconds` of it are
+    kept. When the spotter hears the phrase, that audio is handed to the full
+    `recognizer` so a command spoken in the same breath is not lost, and the
+    full recognizer stays on until it returns a command or `windowSeconds`
+    have gone by, counted both in audio and in wall-clock time since silence
+    dropped by the voice activity gate never reaches it. The wake phrase is
+    removed from the returned text.
+    """
+
+    def __init__(self, spotter, recognizer, wakePhrase, samplerate, windowSeconds=5.0, preRollSeconds=1.5):
+        self.spotter = spotter
+        self.recognizer = recognizer
+        self.wakePhrase = wakePhrase.lower()
+        self.bytesPerSecond = samplerate * 2
+        self.windowSeconds = windowSeconds
+        self.windowBytes = int(windowSeconds * self.bytesPerSecond)
+        self.preRollBytes = int(preRollSeconds * self.bytesPerSecond)
+        self.preRoll = collections.deque()
+        self.preRollSize = 0
+        self.awake = False
+        self.awakeBytes = 0
+        self.awakeAt = 0.0
+        self.result = "{}"
+
+        self.detections = 0
+        self.commands = 0
+        self.asleepBytes = 0
+        self.listenedBytes = 0
+        self.handedOverBytes = 0
+        self.latencies = []
+
+    def SetWords(self, words):
+        self.recognizer.SetWords(words)
+
+    def setMatcher(self, matcher):
+        if hasattr(self.recognizer, "setMatcher"):
+            self.recognizer.setMatcher(matcher)
+
+    def _remember(self, data):
+        self.preRoll.append(data)
+        self.preRollSize += len(data)
+        while self.preRollSize > self.preRollBytes:
+            self.preRollSize -= len(self.preRoll.popleft())
+
+    def _heardWakePhrase(self, heard):
+        if self.wakePhrase not in (heard or ""):
+            return False
+        self.detections += 1
+        self.awake = True
+        self.awakeBytes = 0
+        self.awakeAt = time.monotonic()
+        self.handedOverBytes = self.preRollSize
+        print("Wake word detected, listening for a command...")
+        self.spotter.Reset()
+        blocks = list(self.preRoll)
+        self.preRoll.clear()
+        self.preRollSize = 0
+        for block in blocks:
+            if self._listen(block):
+                return True
+        return False
+
+    def _stripWakePhrase(self, text):
+        # the full recognizer hears the wake phrase too; keep what follows it
+        if self.wakePhrase in text:
+            return text.split(self.wakePhrase, 1)[1].strip()
+        return text
+
+    def _command(self, result):
+        result = json.loads(result)
+        result["text"] = self._stripWakePhrase(result.get("text", ""))
+        return result
+
+    def _windowOver(self):
+        return self.awakeBytes >= self.windowBytes or time.monotonic() - self.awakeAt >= self.windowSeconds
+
+    def _sleep(self, result):
+        self.awake = False
+        if result["text"]:
+            self.commands += 1
+            # seconds of audio after the wake phrase until the command was decoded
+            self.latencies.append(max(0, self.awakeBytes - self.handedOverBytes) / self.bytesPerSecond)
+        self.result = json.dumps(result)
+        return True
+
+    def _listen(self, data):
+        self.awakeBytes += len(data)
+        self.listenedBytes += len(data)
+        if self.recognizer.AcceptWaveform(data):
+            result = self._command(self.recognizer.Result())
+            # a pause right after the wake phrase does not end the window
+            if result["text"] or self._windowOver():
+                return self._sleep(result)
+        elif self._windowOver():
+            return self._sleep(self._command(self.recognizer.FinalResult()))
+        return False
+
+    def AcceptWaveform(self, data):
+        if self.awake and time.monotonic() - self.awakeAt >= self.windowSeconds:
+            # the window ran out during silence; this audio needs the wake phrase again
+            self.recognizer.Reset()
+            self.awake = False
+        if self.awake:
+            return self._listen(data)
+        self.asleepBytes += len(data)
+        self._remember(data)
+        if self.spotter.AcceptWaveform(data):
+            return self._heardWakePhrase(json.loads(self.spotter.Result()).get("text"))
+        return self._heardWakePhrase(json.loads(self.spotter.PartialResult()).get("partial"))
+
+    def Result(self):
+        return self.result
+
+    def PartialResult(self):
+        if not self.awake:
+            return json.dumps({"partial": ""})
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return json.dumps({"partial": self._stripWakePhrase(partial)})
+
+    def FinalResult(self):
+        if not self.awake:
+            self.result = json.dumps({"text": ""})
+            self._heardWakePhrase(json.loads(self.spotter.FinalResult()).get("text"))
+            return self.result
+        result = self._command(self.recognizer.FinalResult())
+        if result["text"] or self._windowOver():
+            self._sleep(result)
+        else:
+            self.result = json.dumps(result)
+        return self.result
+
+    def Reset(self):
+        self.spotter.Reset()
+        self.recognizer.Reset()
+        self.preRoll.clear()
+        self.preRollSize = 0
+        self.awake = False
+
+    def summary(self):
+        total = (self.asleepBytes + self.listenedBytes) / self.bytesPerSecond
+        awake = self.listenedBytes / self.bytesPerSecond
+        line = (f"Wake word: {self.detections} detections, {self.commands} commands, full recognizer on for "
+                f"{awake:.0f}s of {total:.0f}s")
+        if self.latencies:
+            latencies = sorted(self.latencies)
+            line += f", wake to command p50 {latencies[len(latencies) // 2] * 1000:.0f} ms"
+        return line
@@ -0,0 +1,46 @@
+import os
+import wave
+
+
+def readWavBlocks(path, blockFrames=1024):
+    with wave.open(path, "rb") as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit mono PCM")
+        samplerate = wav.getframerate()
+        blocks = []
+        while True:
+            data = wav.readframes(blockFrames)
+            if not data:
+                break
+            blocks.append(data)
+    return samplerate, blocks
+
+
+def findWavs(paths):
+    wavs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in sorted(os.walk(path)):
+                wavs += [os.path.join(directory, name) for name in sorted(names) if name.endswith(".wav")]
+        else:
+            wavs.append(path)
+    return wavs
+
+
+def readLabels(path):
+    labels = {}
+    with open(path) as labelFile:
+        for line in labelFile:
+            if line.strip() and not line.startswith("#"):
+                wavPath, _, command = line.rstrip("\n").partition("\t")
+                labels[os.path.normpath(wavPath)] = command.strip() or None
+    return labels
+
+
+def expectedCommand(path, labels, commandNames):
+    if labels is not None:
+        return labels.get(os.path.normpath(path))
+    directory = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    if directory in commandNames or directory == "none":
+        return directory
+    return None